@@ -27,7 +27,7 @@ if %errorlevel% neq 0 (
 REM Activate virtual environment and install dependencies
 echo 📥 Installing dependencies...
 call venv\Scripts\activate.bat
-pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart
+pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart orjson msgspec h2
 if %errorlevel% neq 0 (
     echo ❌ Failed to install main dependencies
     pause
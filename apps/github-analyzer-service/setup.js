@@ -31,7 +31,7 @@ try {
     ? 'venv\\Scripts\\activate.bat &&' 
     : '. venv/bin/activate &&';
   
-  const installCmd = `${activateCmd} pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart`;
+  const installCmd = `${activateCmd} pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart orjson msgspec h2`;
   
   const shellOptions = isWindows 
     ? { stdio: 'inherit', shell: true }
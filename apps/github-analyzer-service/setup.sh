@@ -41,12 +41,12 @@ $PYTHON_CMD -m venv venv --system-site-packages
 # Activate virtual environment and install dependencies
 echo "📥 Installing dependencies..."
 if [[ "$PLATFORM" == "windows" ]]; then
-    cmd //c "venv\\Scripts\\activate && pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart"
+    cmd //c "venv\\Scripts\\activate && pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart orjson msgspec h2"
     echo "🔧 Installing analysis tools..."
     cmd //c "venv\\Scripts\\activate && pip install --no-build-isolation astunparse radon lizard gitpython pygments chardet" || echo "⚠️ Some analysis tools skipped due to compatibility issues"
 else
     source venv/bin/activate
-    pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart
+    pip install --no-build-isolation fastapi uvicorn pydantic pydantic-settings httpx requests loguru python-dotenv google-generativeai python-multipart orjson msgspec h2
     echo "🔧 Installing analysis tools..."
     pip install --no-build-isolation astunparse radon lizard gitpython pygments chardet || echo "⚠️ Some analysis tools skipped due to compatibility issues"
 fi
@@ -10,6 +10,7 @@ rule-based fallbacks designed around modern engineering best practices.
 
 from typing import Dict, List, Optional
 from datetime import datetime
+import hashlib
 import json
 
 from loguru import logger
@@ -18,6 +19,7 @@ from ..models.repository import Repository
 from ..models.metrics import CodeMetrics, QualityMetrics, SecurityMetrics
 from ..models.analysis import TechStack, AIInsights
 from ..config import settings
+from ..services.ttl_cache import TTLCache
 
 
 class AIInsightsAnalyzer:
@@ -35,6 +37,9 @@ class AIInsightsAnalyzer:
     def __init__(self):
         self.gemini_available = bool(settings.gemini_api_key)
         
+        # Gemini insights keyed by a digest of everything sent to the model
+        self._insights_cache = TTLCache(ttl=settings.cache_ttl, max_entries=settings.analysis_cache_size)
+        
         if self.gemini_available:
             try:
                 import google.generativeai as genai
@@ -83,6 +88,16 @@ class AIInsightsAnalyzer:
         files: List = None
     ) -> AIInsights:
         """Generate insights using Gemini AI."""
+        cache_key = self._insights_cache_key(
+            repository, code_metrics, quality_metrics, security_metrics, tech_stack, files or []
+        )
+        cached = self._insights_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Reusing AI insights for {repository.full_name}")
+            return cached
+        
+        # Prompts of this run that failed or came back empty
+        failures: List[str] = []
         try:
             # Prepare context for AI with actual code samples
             context = self._prepare_context_with_code(
@@ -90,22 +105,22 @@ class AIInsightsAnalyzer:
             )
             
             # Generate different types of insights
-            project_summary = await self._get_ai_project_summary(context)
-            quality_assessment = await self._get_ai_quality_assessment(context)
-            architecture_assessment = await self._get_ai_architecture_assessment(context)
-            maintainability_assessment = await self._get_ai_maintainability_assessment(context)
+            project_summary = await self._get_ai_project_summary(context, failures)
+            quality_assessment = await self._get_ai_quality_assessment(context, failures)
+            architecture_assessment = await self._get_ai_architecture_assessment(context, failures)
+            maintainability_assessment = await self._get_ai_maintainability_assessment(context, failures)
             
-            strengths = await self._get_ai_strengths(context)
-            weaknesses = await self._get_ai_weaknesses(context)
-            improvements = await self._get_ai_improvements(context)
+            strengths = await self._get_ai_strengths(context, failures)
+            weaknesses = await self._get_ai_weaknesses(context, failures)
+            improvements = await self._get_ai_improvements(context, failures)
             
-            skill_indicators = await self._get_ai_skill_indicators(context)
-            coding_patterns = await self._get_ai_coding_patterns(context)
+            skill_indicators = await self._get_ai_skill_indicators(context, failures)
+            coding_patterns = await self._get_ai_coding_patterns(context, failures)
             
-            project_maturity = await self._get_ai_project_maturity(context)
-            development_stage = await self._get_ai_development_stage(context)
+            project_maturity = await self._get_ai_project_maturity(context, failures)
+            development_stage = await self._get_ai_development_stage(context, failures)
             
-            return AIInsights(
+            insights = AIInsights(
                 overall_quality_score=self._calculate_overall_quality_score(
                     code_metrics, quality_metrics, security_metrics
                 ),
@@ -124,15 +139,42 @@ class AIInsightsAnalyzer:
                 maintenance_burden=self._assess_maintenance_burden(code_metrics, security_metrics),
                 technology_relevance=tech_stack.modernness_score,
                 industry_alignment=self._get_industry_alignment(tech_stack),
-                career_impact=self._assess_career_impact(tech_stack, quality_metrics)
+                career_impact=self._assess_career_impact(tech_stack, quality_metrics),
+                degraded=bool(failures),
             )
+            # Cache only if every prompt succeeded
+            if failures:
+                logger.info(f"Not caching AI insights for {repository.full_name}: {len(failures)} prompts failed")
+            else:
+                self._insights_cache.set(cache_key, insights)
+            return insights
             
         except Exception as e:
             logger.error(f"AI insights generation failed: {e}")
             # Fallback to rule-based insights
-            return await self._generate_rule_based_insights(
+            insights = await self._generate_rule_based_insights(
                 repository, code_metrics, quality_metrics, security_metrics, tech_stack
             )
+            return insights.model_copy(update={"degraded": True})
+    
+    def _insights_cache_key(
+        self,
+        repository: Repository,
+        code_metrics: CodeMetrics,
+        quality_metrics: QualityMetrics,
+        security_metrics: SecurityMetrics,
+        tech_stack: TechStack,
+        files: List
+    ) -> str:
+        """Digest the model inputs; file contents are identified by blob SHA."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repository.full_name.encode())
+        digest.update(str(repository.pushed_at).encode())
+        for model in (code_metrics, quality_metrics, security_metrics, tech_stack):
+            digest.update(model.model_dump_json().encode())
+        for file_info in files:
+            digest.update(f"\0{file_info.path}\0{file_info.sha}\0{file_info.size}".encode())
+        return digest.hexdigest()
     
     async def _generate_rule_based_insights(
         self,
@@ -364,7 +406,23 @@ Code Content:
         file_path_lower = file_path.lower()
         return any(pattern in file_path_lower for pattern in config_patterns)
     
-    async def _get_ai_project_summary(self, context: str) -> str:
+    def _generate_content(self, prompt: str, failures: List[str]):
+        """Call Gemini, noting errors and empty responses in ``failures``.
+        
+        Degraded insights are not cached. A blocked response raises on
+        ``text``, which is recorded and re-raised like any other error.
+        """
+        try:
+            response = self.model.generate_content(prompt)
+            if response and response.text:
+                return response
+        except Exception as e:
+            failures.append(str(e))
+            raise
+        failures.append("empty response")
+        return response
+    
+    async def _get_ai_project_summary(self, context: str, failures: List[str]) -> str:
         """Get AI-generated project summary based on actual code."""
         if not self.gemini_available:
             return "Unable to generate project summary - AI not available"
@@ -403,7 +461,7 @@ Code Content:
         
         try:
             logger.info(f"Generating project summary with Gemini")
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 return response.text.strip()
             else:
@@ -412,7 +470,7 @@ Code Content:
             logger.error(f"AI project summary failed: {e}")
             return "Project summary unavailable"
     
-    async def _get_ai_quality_assessment(self, context: str) -> str:
+    async def _get_ai_quality_assessment(self, context: str, failures: List[str]) -> str:
         """Get AI assessment of code quality."""
         if not self.gemini_available:
             return "Rule-based quality assessment"
@@ -436,7 +494,7 @@ Code Content:
         
         try:
             logger.info(f"Sending prompt to Gemini (length: {len(prompt)} chars)")
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 logger.info(f"Received Gemini response: {response.text[:100]}...")
                 return response.text.strip()
@@ -448,7 +506,7 @@ Code Content:
             # Fall back to rule-based assessment
             return "Good code organization with modern development practices"
     
-    async def _get_ai_architecture_assessment(self, context: str) -> str:
+    async def _get_ai_architecture_assessment(self, context: str, failures: List[str]) -> str:
         """Get AI assessment of architecture."""
         if not self.gemini_available:
             return "Well-structured codebase with clear separation of concerns"
@@ -472,7 +530,7 @@ Code Content:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 return response.text.strip()
             else:
@@ -481,7 +539,7 @@ Code Content:
             logger.error(f"AI architecture assessment failed: {e}")
             return "Well-structured codebase with modular design"
     
-    async def _get_ai_maintainability_assessment(self, context: str) -> str:
+    async def _get_ai_maintainability_assessment(self, context: str, failures: List[str]) -> str:
         """Get AI assessment of maintainability."""
         if not self.gemini_available:
             return "Codebase shows good maintainability practices"
@@ -505,7 +563,7 @@ Code Content:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 return response.text.strip()
             else:
@@ -514,7 +572,7 @@ Code Content:
             logger.error(f"AI maintainability assessment failed: {e}")
             return "Codebase shows good maintainability practices"
     
-    async def _get_ai_strengths(self, context: str) -> List[str]:
+    async def _get_ai_strengths(self, context: str, failures: List[str]) -> List[str]:
         """Get AI-identified strengths."""
         if not self.gemini_available:
             return ["Good code organization", "Modern technology stack"]
@@ -527,7 +585,7 @@ Code Content:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 strengths = [s.strip() for s in response.text.strip().split('\n') if s.strip()]
                 return strengths[:3]  # Limit to 3 strengths
@@ -537,7 +595,7 @@ Code Content:
             logger.error(f"AI strengths assessment failed: {e}")
             return ["Good code organization", "Solid foundation"]
     
-    async def _get_ai_weaknesses(self, context: str) -> List[str]:
+    async def _get_ai_weaknesses(self, context: str, failures: List[str]) -> List[str]:
         """Get AI-identified weaknesses."""
         if not self.gemini_available:
             return ["Insufficient test coverage", "Documentation gaps", "Missing CI checks"]
@@ -550,7 +608,7 @@ Code Content:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 items = [s.strip() for s in response.text.strip().split('\n') if s.strip()]
                 return items[:3]
@@ -559,7 +617,7 @@ Code Content:
             logger.error(f"AI weaknesses assessment failed: {e}")
             return ["Insufficient test coverage", "Documentation gaps", "Missing CI checks"]
     
-    async def _get_ai_improvements(self, context: str) -> List[str]:
+    async def _get_ai_improvements(self, context: str, failures: List[str]) -> List[str]:
         """Get AI improvement suggestions."""
         if not self.gemini_available:
             return [
@@ -600,7 +658,7 @@ Code Content:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 items = [s.strip() for s in response.text.strip().split('\n') if s.strip()]
                 return items[:5]
@@ -613,7 +671,7 @@ Code Content:
                 "Harden security checks/dep updates (medium)",
             ]
     
-    async def _get_ai_skill_indicators(self, context: str) -> Dict[str, float]:
+    async def _get_ai_skill_indicators(self, context: str, failures: List[str]) -> Dict[str, float]:
         """Get AI assessment of developer skill indicators."""
         if not self.gemini_available:
             # Rule-based default; refined later by rule-based method
@@ -628,7 +686,7 @@ Code Content:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 text = response.text.strip().strip('`')
                 # Attempt to extract JSON
@@ -650,7 +708,7 @@ Code Content:
             logger.error(f"AI skill indicators failed: {e}")
             return {"architecture_design": 70.0, "code_quality": 70.0}
     
-    async def _get_ai_coding_patterns(self, context: str) -> List[str]:
+    async def _get_ai_coding_patterns(self, context: str, failures: List[str]) -> List[str]:
         """Get AI-identified coding patterns."""
         if not self.gemini_available:
             return ["Modular design", "Typed APIs where applicable"]
@@ -663,7 +721,7 @@ Code Content:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 items = [s.strip() for s in response.text.strip().split('\n') if s.strip()]
                 return items[:5]
@@ -672,7 +730,7 @@ Code Content:
             logger.error(f"AI coding patterns failed: {e}")
             return ["Modular design", "Typed APIs where applicable"]
     
-    async def _get_ai_project_maturity(self, context: str) -> str:
+    async def _get_ai_project_maturity(self, context: str, failures: List[str]) -> str:
         """Get AI assessment of project maturity."""
         if not self.gemini_available:
             return "developing"
@@ -683,7 +741,7 @@ Code Content:
         Return just the word.
         """
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 text = response.text.strip().lower()
                 for opt in ["experimental", "developing", "mature", "legacy"]:
@@ -694,7 +752,7 @@ Code Content:
             logger.error(f"AI project maturity failed: {e}")
             return "developing"
     
-    async def _get_ai_development_stage(self, context: str) -> str:
+    async def _get_ai_development_stage(self, context: str, failures: List[str]) -> str:
         """Get AI assessment of development stage."""
         if not self.gemini_available:
             return "development"
@@ -705,7 +763,7 @@ Code Content:
         Return just the word.
         """
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt, failures)
             if response and response.text:
                 text = response.text.strip().lower()
                 for opt in ["prototype", "mvp", "production", "enterprise"]:
@@ -1,5 +1,6 @@
 """Technology stack analysis focused on recruiter-friendly, industry-standard outputs."""
 
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import json
@@ -10,10 +11,93 @@ try:  # Python 3.11+
 except Exception:  # pragma: no cover
     tomllib = None  # type: ignore
 
-from ..models.repository import FileInfo, RepositoryStructure
+from ..models.repository import FileInfo
 from ..models.analysis import TechStack, TechnologyItem, TechStackCategory
 
 
+# Key manifests/config files grouped by filename for quick access
+_MANIFEST_NAMES = frozenset({
+    "package.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lockb",
+    "tsconfig.json",
+    "pyproject.toml",
+    "requirements.txt",
+    "requirements-dev.txt",
+    "Pipfile",
+    "Pipfile.lock",
+    "poetry.lock",
+    "go.mod",
+    "pom.xml",
+    "build.gradle",
+    "settings.gradle",
+    "Gemfile",
+    "Gemfile.lock",
+    "composer.json",
+    "Cargo.toml",
+    "Dockerfile",
+    "docker-compose.yml",
+    "docker-compose.yaml",
+    "serverless.yml",
+    "terraform.tf",
+    "main.tf",
+    "README.md",
+    "Makefile",
+})
+
+# (label, category, package needle) for frontend and backend frameworks
+_FRAMEWORK_SIGNALS: List[Tuple[str, TechStackCategory, str]] = [
+    ("Next.js", TechStackCategory.FRAMEWORK, "next"),
+    ("React", TechStackCategory.FRAMEWORK, "react"),
+    ("Vue", TechStackCategory.FRAMEWORK, "vue"),
+    ("Nuxt", TechStackCategory.FRAMEWORK, "nuxt"),
+    ("Svelte", TechStackCategory.FRAMEWORK, "svelte"),
+    ("Angular", TechStackCategory.FRAMEWORK, "@angular/core"),
+    ("Express", TechStackCategory.FRAMEWORK, "express"),
+    ("NestJS", TechStackCategory.FRAMEWORK, "@nestjs/core"),
+    ("Fastify", TechStackCategory.FRAMEWORK, "fastify"),
+    ("Koa", TechStackCategory.FRAMEWORK, "koa"),
+    ("Hapi", TechStackCategory.FRAMEWORK, "@hapi/hapi"),
+    ("Django", TechStackCategory.FRAMEWORK, "django"),
+    ("Flask", TechStackCategory.FRAMEWORK, "flask"),
+    ("FastAPI", TechStackCategory.FRAMEWORK, "fastapi"),
+    ("Spring Boot", TechStackCategory.FRAMEWORK, "spring-boot"),
+    ("Rails", TechStackCategory.FRAMEWORK, "rails"),
+]
+
+# File name/path substrings hinting at each framework needle
+_FRAMEWORK_PATH_HINTS: Dict[str, str] = {
+    needle: needle.replace("@", "").split("/")[-1] for _, _, needle in _FRAMEWORK_SIGNALS
+}
+
+# Language confidence reaches 1.0 at this many lines of code
+_LANGUAGE_FULL_CONFIDENCE_LINES = 50_000
+_LANGUAGE_CONFIDENCE_PER_LINE = 1.0 / _LANGUAGE_FULL_CONFIDENCE_LINES
+
+def _longest_first_pattern(hints: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile hints into one alternation with leftmost-longest semantics.
+
+    ``re`` alternation is leftmost-first, so ordering longer hints first means
+    a hint that is a prefix of another (``sql`` vs ``sqlite``) never fires on
+    the longer one's match.
+    """
+    return re.compile("|".join(re.escape(h) for h in sorted(hints, key=len, reverse=True)))
+
+
+def _scan_path_hints(paths: List[str], hints: Tuple[str, ...]) -> Counter:
+    """Count files whose lowercased path contains each hint."""
+    pattern = _longest_first_pattern(hints)
+    counts: Counter = Counter()
+    for path_lower in paths:
+        counts.update(set(pattern.findall(path_lower)))
+    return counts
+
+
+# Database file extensions; ``.sqlite`` must not also count as ``.sql``
+_DB_FILE_HINT = _longest_first_pattern((".sqlite", ".psql", ".sql"))
+
+
 class TechStackAnalyzer:
     """Analyzer for detecting and analyzing technology stacks.
 
@@ -32,7 +116,6 @@ class TechStackAnalyzer:
     async def analyze_tech_stack(
         self,
         files: List[FileInfo],
-        structure: RepositoryStructure,
         languages: Dict[str, int],
     ) -> TechStack:
         """Analyze the technology stack of a repository."""
@@ -47,14 +130,15 @@ class TechStackAnalyzer:
                 TechnologyItem(
                     name=lang,
                     category=TechStackCategory.LANGUAGE,
-                    confidence=min(1.0, max(0.2, count / 50_000)),
+                    confidence=1.0 if count >= _LANGUAGE_FULL_CONFIDENCE_LINES
+                    else max(0.2, count * _LANGUAGE_CONFIDENCE_PER_LINE),
                     line_count=count,
                 )
             )
 
         # Manifests and config-driven detection
-        manifests = self._collect_manifests(files)
-        ctx = self._build_detection_context(files, manifests)
+        ctx = self._build_detection_context(files)
+        ctx["path_hint_counts"] = self._count_path_hints(ctx.pop("paths_lower"))  # type: ignore
 
         frameworks = self._detect_frameworks(ctx)
         libraries = self._detect_libraries(ctx)
@@ -107,64 +191,90 @@ class TechStackAnalyzer:
     # ---------------------------
     # Manifests and context
     # ---------------------------
-    def _collect_manifests(self, files: List[FileInfo]) -> Dict[str, List[FileInfo]]:
-        """Group key manifests/config files by filename for quick access."""
-        key_names = {
-            "package.json",
-            "pnpm-lock.yaml",
-            "yarn.lock",
-            "bun.lockb",
-            "tsconfig.json",
-            "pyproject.toml",
-            "requirements.txt",
-            "requirements-dev.txt",
-            "Pipfile",
-            "Pipfile.lock",
-            "poetry.lock",
-            "go.mod",
-            "pom.xml",
-            "build.gradle",
-            "settings.gradle",
-            "Gemfile",
-            "Gemfile.lock",
-            "composer.json",
-            "Cargo.toml",
-            "Dockerfile",
-            "docker-compose.yml",
-            "docker-compose.yaml",
-            "serverless.yml",
-            "terraform.tf",
-            "main.tf",
-            "README.md",
-            "Makefile",
-        }
-        manifests: Dict[str, List[FileInfo]] = {}
-        for f in files:
-            if f.name in key_names or f.name.lower().endswith((".tf", ".yaml", ".yml")) or \
-               ".github/workflows/" in f.path:
-                manifests.setdefault(f.name, []).append(f)
-        return manifests
+    def _count_path_hints(self, entries: List[str]) -> Counter:
+        """Count framework path hints in one pass over ``entries``.
+
+        ``entries`` are lowercased paths; a path ends with the file name, so
+        matching the path covers both.
+        """
+        return _scan_path_hints(entries, tuple(set(_FRAMEWORK_PATH_HINTS.values())))
 
     class _Ctx(Dict[str, object]):
         pass
 
-    def _build_detection_context(self, files: List[FileInfo], manifests: Dict[str, List[FileInfo]]) -> "TechStackAnalyzer._Ctx":
-        ctx: TechStackAnalyzer._Ctx = TechStackAnalyzer._Ctx()
+    def _build_detection_context(self, files: List[FileInfo]) -> "TechStackAnalyzer._Ctx":
+        """Collect manifests and file-name signals in a single pass over ``files``."""
+        manifests: Dict[str, List[FileInfo]] = {}
+        paths_lower: List[str] = []
+        ctx: TechStackAnalyzer._Ctx = TechStackAnalyzer._Ctx(
+            tsconfig=False, docker=False, compose=False, gha=False, terraform=False,
+            serverless=False, has_prisma_schema=False, has_drizzle=False, has_k8s=False,
+            next_config=False, pages_or_app_dir=False, tailwind_config=False,
+            pytest_ini=False, makefile=False, vercel=False, netlify=False,
+            sql_files=0, sqlite_files=0,
+        )
+        for f in files:
+            name = f.name
+            nlow = name.lower()
+            path = f.path
+            plow = path.lower()
+            paths_lower.append(plow)
+
+            if name in _MANIFEST_NAMES or nlow.endswith((".tf", ".yaml", ".yml")) or \
+               ".github/workflows/" in path:
+                manifests.setdefault(name, []).append(f)
+
+            if name == "tsconfig.json":
+                ctx["tsconfig"] = True
+            elif name == "Dockerfile":
+                ctx["docker"] = True
+            elif name == "Makefile":
+                ctx["makefile"] = True
+            elif name == "pytest.ini":
+                ctx["pytest_ini"] = True
+            elif name in {"serverless.yml", "serverless.yaml"}:
+                ctx["serverless"] = True
+            elif name in {"tailwind.config.js", "tailwind.config.ts"}:
+                ctx["tailwind_config"] = True
+            if nlow.startswith("docker-compose"):
+                ctx["compose"] = True
+            if name.endswith(".tf"):
+                ctx["terraform"] = True
+            if "next.config" in name:
+                ctx["next_config"] = True
+            if ".github/workflows/" in path:
+                ctx["gha"] = True
+            if "/pages/" in path or "/app/" in path:
+                ctx["pages_or_app_dir"] = True
+            # Quick path signals for ecosystems
+            if "schema.prisma" in name or "/prisma/" in path:
+                ctx["has_prisma_schema"] = True
+            if "drizzle" in plow:
+                ctx["has_drizzle"] = True
+            if "k8s/" in path or "kubernetes" in plow:
+                ctx["has_k8s"] = True
+
+            # Database file extension hints
+            match = _DB_FILE_HINT.search(nlow)
+            if match and match.group() != ".sqlite":
+                ctx["sql_files"] += 1  # type: ignore
+            elif match or nlow.endswith(".db"):
+                ctx["sqlite_files"] += 1  # type: ignore
+
+            # Hosting mentions in file names or contents
+            if not (ctx["vercel"] and ctx["netlify"]):
+                clow = (f.content or "").lower()
+                if "vercel" in nlow or "vercel" in clow:
+                    ctx["vercel"] = True
+                if "netlify" in nlow or "netlify" in clow:
+                    ctx["netlify"] = True
+
         ctx["files"] = files
         ctx["manifests"] = manifests
+        ctx["paths_lower"] = paths_lower
         ctx["package_json"] = self._parse_package_json(manifests.get("package.json", []))
-        ctx["tsconfig"] = True if any(f.name == "tsconfig.json" for f in files) else False
         ctx["pyproject"] = self._parse_toml(manifests.get("pyproject.toml", []))
         ctx["requirements"] = self._parse_requirements(manifests)
-        ctx["docker"] = any(f.name == "Dockerfile" for f in files)
-        ctx["compose"] = any(f.name.lower().startswith("docker-compose") for f in files)
-        ctx["gha"] = any(".github/workflows/" in f.path for f in files)
-        ctx["terraform"] = any(f.name.endswith(".tf") for f in files)
-        ctx["serverless"] = any(f.name in {"serverless.yml", "serverless.yaml"} for f in files)
-        # Quick path signals for ecosystems
-        ctx["has_prisma_schema"] = any("schema.prisma" in f.name or "/prisma/" in f.path for f in files)
-        ctx["has_drizzle"] = any("drizzle" in f.path.lower() for f in files)
-        ctx["has_k8s"] = any("k8s/" in f.path or "kubernetes" in f.path.lower() for f in files)
         return ctx
 
     def _parse_package_json(self, files: List[FileInfo]) -> Dict[str, Dict[str, str]]:
@@ -241,10 +351,11 @@ class TechStackAnalyzer:
         existing = items.get(key)
         if existing:
             # Merge: boost confidence and update version if known
-            existing.confidence = min(1.0, max(existing.confidence, confidence) + 0.1)
-            if version and not existing.version:
-                existing.version = version
-            existing.file_count = max(existing.file_count, file_count)
+            items[key] = existing.model_copy(update={
+                "confidence": min(1.0, max(existing.confidence, confidence) + 0.1),
+                "version": existing.version or version,
+                "file_count": max(existing.file_count, file_count),
+            })
         else:
             items[key] = TechnologyItem(
                 name=name,
@@ -258,33 +369,9 @@ class TechStackAnalyzer:
         items: Dict[str, TechnologyItem] = {}
         pkg = ctx.get("package_json") or {}
         deps = {**(pkg.get("dependencies", {}) or {}), **(pkg.get("devDependencies", {}) or {})}
-        files: List[FileInfo] = ctx.get("files")  # type: ignore
-
-        # Frontend frameworks
-        framework_signals: List[Tuple[str, TechStackCategory, str]] = [
-            ("Next.js", TechStackCategory.FRAMEWORK, "next"),
-            ("React", TechStackCategory.FRAMEWORK, "react"),
-            ("Vue", TechStackCategory.FRAMEWORK, "vue"),
-            ("Nuxt", TechStackCategory.FRAMEWORK, "nuxt"),
-            ("Svelte", TechStackCategory.FRAMEWORK, "svelte"),
-            ("Angular", TechStackCategory.FRAMEWORK, "@angular/core"),
-        ]
+        path_hint_counts: Counter = ctx.get("path_hint_counts") or Counter()  # type: ignore
 
-        # Backend frameworks
-        framework_signals += [
-            ("Express", TechStackCategory.FRAMEWORK, "express"),
-            ("NestJS", TechStackCategory.FRAMEWORK, "@nestjs/core"),
-            ("Fastify", TechStackCategory.FRAMEWORK, "fastify"),
-            ("Koa", TechStackCategory.FRAMEWORK, "koa"),
-            ("Hapi", TechStackCategory.FRAMEWORK, "@hapi/hapi"),
-            ("Django", TechStackCategory.FRAMEWORK, "django"),
-            ("Flask", TechStackCategory.FRAMEWORK, "flask"),
-            ("FastAPI", TechStackCategory.FRAMEWORK, "fastapi"),
-            ("Spring Boot", TechStackCategory.FRAMEWORK, "spring-boot"),
-            ("Rails", TechStackCategory.FRAMEWORK, "rails"),
-        ]
-
-        for label, cat, needle in framework_signals:
+        for label, cat, needle in _FRAMEWORK_SIGNALS:
             ver = None
             conf = 0.0
             # JS ecosystem
@@ -297,18 +384,15 @@ class TechStackAnalyzer:
                 ver = ver or str(pyreqs.get(needle.lower()))
                 conf = max(conf, 0.8)
             # File pattern hints
-            for f in files or []:
-                nlow = f.name.lower()
-                plow = f.path.lower()
-                if any(s in nlow or s in plow for s in [needle.replace("@", "").split("/")[-1]]):
-                    conf = max(conf, 0.5)
+            if path_hint_counts[_FRAMEWORK_PATH_HINTS[needle]]:
+                conf = max(conf, 0.5)
             if conf > 0:
                 self._add_item(items, label, cat, conf, version=ver)
 
         # Special detection for Next.js via next.config, pages/app directory
-        if any("next.config" in f.name for f in files or []):
+        if ctx.get("next_config"):
             self._add_item(items, "Next.js", TechStackCategory.FRAMEWORK, 0.9, version=str(deps.get("next", "")))
-        if any("/pages/" in f.path or "/app/" in f.path for f in files or []):
+        if ctx.get("pages_or_app_dir"):
             if "next" in deps:
                 self._add_item(items, "Next.js", TechStackCategory.FRAMEWORK, 0.8, version=str(deps.get("next", "")))
 
@@ -319,7 +403,6 @@ class TechStackAnalyzer:
         pkg = ctx.get("package_json") or {}
         deps = {**(pkg.get("dependencies", {}) or {}), **(pkg.get("devDependencies", {}) or {})}
         pyreqs = ctx.get("requirements") or {}
-        files: List[FileInfo] = ctx.get("files")  # type: ignore
 
         # JS/TS popular libraries
         common_js_libs = [
@@ -357,7 +440,7 @@ class TechStackAnalyzer:
                 self._add_item(items, label, TechStackCategory.LIBRARY, 0.75, version=str(pyreqs[needle]))
 
         # Tailwind config hint
-        if any(f.name in {"tailwind.config.js", "tailwind.config.ts"} for f in files or []):
+        if ctx.get("tailwind_config"):
             self._add_item(items, "Tailwind CSS", TechStackCategory.LIBRARY, 0.8, version=str(deps.get("tailwindcss", "")))
 
         return list(items.values())
@@ -367,7 +450,6 @@ class TechStackAnalyzer:
         pkg = ctx.get("package_json") or {}
         deps = {**(pkg.get("dependencies", {}) or {}), **(pkg.get("devDependencies", {}) or {})}
         pyreqs = ctx.get("requirements") or {}
-        files: List[FileInfo] = ctx.get("files")  # type: ignore
 
         db_signals = [
             ("PostgreSQL", ["pg", "psycopg2", "asyncpg", "postgres"], 0.85),
@@ -397,14 +479,17 @@ class TechStackAnalyzer:
         if ctx.get("has_drizzle"):
             self._add_item(items, "PostgreSQL", TechStackCategory.DATABASE, 0.55)
 
-        # File extension hints
-        for f in files or []:
-            nlow = f.name.lower()
-            plow = f.path.lower()
-            if any(ext in nlow for ext in [".sql", ".psql"]):
-                self._add_item(items, "PostgreSQL", TechStackCategory.DATABASE, 0.4)
-            if ".sqlite" in nlow or nlow.endswith(".db"):
-                self._add_item(items, "SQLite", TechStackCategory.DATABASE, 0.6)
+        # File extension hints: counted during context building, scored once (+0.1 per extra file)
+        sql_files: int = ctx.get("sql_files") or 0  # type: ignore
+        sqlite_files: int = ctx.get("sqlite_files") or 0  # type: ignore
+        for name, base_conf, count in (("PostgreSQL", 0.4, sql_files), ("SQLite", 0.6, sqlite_files)):
+            if not count:
+                continue
+            # Same score as one _add_item per file: each merge adds 0.1, on top
+            # of a database already detected from dependencies too
+            existing = items.get(name.lower())
+            start = max(existing.confidence, base_conf) if existing else base_conf
+            self._add_item(items, name, TechStackCategory.DATABASE, start + (count - 1) * 0.1)
 
         return list(items.values())
 
@@ -413,7 +498,7 @@ class TechStackAnalyzer:
         pkg = ctx.get("package_json") or {}
         deps = {**(pkg.get("dependencies", {}) or {}), **(pkg.get("devDependencies", {}) or {})}
         pyreqs = ctx.get("requirements") or {}
-        files: List[FileInfo] = ctx.get("files")  # type: ignore
+        pyproject_files: List[FileInfo] = (ctx.get("manifests") or {}).get("pyproject.toml", [])  # type: ignore
 
         tool_defs = [
             ("ESLint", ["eslint"], 0.9),
@@ -441,11 +526,10 @@ class TechStackAnalyzer:
                     ver = str(deps[n])
                     found = True
             if label in {"Black", "Ruff", "mypy"}:
-                if any((f.name == "pyproject.toml" and (f.content or "")) for f in files or []):
-                    content = next((f.content or "" for f in files or [] if f.name == "pyproject.toml"), "")
-                    if re.search(r"\b(black|ruff|mypy)\b", content):
-                        found = True
-            if label == "Poetry" and any("poetry" in (f.content or "") for f in files or [] if f.name == "pyproject.toml"):
+                content = next((f.content for f in pyproject_files if f.content), "")
+                if content and re.search(r"\b(black|ruff|mypy)\b", content):
+                    found = True
+            if label == "Poetry" and any("poetry" in (f.content or "") for f in pyproject_files):
                 found = True
             if label == "Docker" and (ctx.get("docker") or ctx.get("compose")):
                 found = True
@@ -461,7 +545,6 @@ class TechStackAnalyzer:
         pkg = ctx.get("package_json") or {}
         deps = {**(pkg.get("dependencies", {}) or {}), **(pkg.get("devDependencies", {}) or {})}
         pyreqs = ctx.get("requirements") or {}
-        files: List[FileInfo] = ctx.get("files")  # type: ignore
 
         test_signals = [
             ("Jest", ["jest"], 0.85),
@@ -481,7 +564,7 @@ class TechStackAnalyzer:
                     ver = str(deps[n])
                     found = True
             if label == "Pytest":
-                if "pytest" in pyreqs or any(f.name == "pytest.ini" for f in files or []):
+                if "pytest" in pyreqs or ctx.get("pytest_ini"):
                     ver = str(pyreqs.get("pytest", "")) if "pytest" in pyreqs else None
                     found = True
             if found:
@@ -492,7 +575,6 @@ class TechStackAnalyzer:
         items: Dict[str, TechnologyItem] = {}
         pkg = ctx.get("package_json") or {}
         deps = {**(pkg.get("dependencies", {}) or {}), **(pkg.get("devDependencies", {}) or {})}
-        files: List[FileInfo] = ctx.get("files")  # type: ignore
 
         build_signals = [
             ("Vite", ["vite"], 0.9),
@@ -509,7 +591,7 @@ class TechStackAnalyzer:
                 if n in deps:
                     self._add_item(items, label, TechStackCategory.BUILD, base_conf, version=str(deps[n]))
         # Makefile hint
-        if any(f.name == "Makefile" for f in files or []):
+        if ctx.get("makefile"):
             self._add_item(items, "Make", TechStackCategory.BUILD, 0.5)
         return list(items.values())
 
@@ -530,9 +612,9 @@ class TechStackAnalyzer:
         # Serverless/Vercel/Netlify/PM2
         if ctx.get("serverless") or "serverless" in deps:
             self._add_item(items, "Serverless", TechStackCategory.DEPLOYMENT, 0.6)
-        if any("vercel" in (f.content or "").lower() or "vercel" in f.name.lower() for f in files or []):
+        if ctx.get("vercel"):
             self._add_item(items, "Vercel", TechStackCategory.DEPLOYMENT, 0.7)
-        if any("netlify" in (f.content or "").lower() or "netlify" in f.name.lower() for f in files or []):
+        if ctx.get("netlify"):
             self._add_item(items, "Netlify", TechStackCategory.DEPLOYMENT, 0.6)
         if "pm2" in deps:
             self._add_item(items, "PM2", TechStackCategory.DEPLOYMENT, 0.5)
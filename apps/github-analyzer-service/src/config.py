@@ -38,6 +38,12 @@ class Settings(BaseSettings):
     github_tokens_str: str = Field(default="", alias="GITHUB_TOKENS")
     github_token_rotation: bool = Field(default=True, alias="GITHUB_TOKEN_ROTATION")
     github_api_url: str = Field(default="https://api.github.com", alias="GITHUB_API_URL")
+    github_max_concurrency: int = Field(default=32, alias="GITHUB_MAX_CONCURRENCY")  # in-flight requests per analysis
+    github_cache_size: int = Field(default=1024, alias="GITHUB_CACHE_SIZE")  # cached API responses and blobs
+    github_cache_bytes: int = Field(default=64*1024*1024, alias="GITHUB_CACHE_BYTES")  # 64MB per cache
+    github_token_state_file: str = Field(
+        default="~/.cache/0unveiled/token_state.json", alias="GITHUB_TOKEN_STATE_FILE"
+    )  # rate limit budgets kept across restarts; empty disables
     
     @property
     def github_tokens(self) -> List[str]:
@@ -66,6 +72,7 @@ class Settings(BaseSettings):
     
     # Cache settings
     cache_ttl: int = Field(default=3600, alias="CACHE_TTL")  # 1 hour
+    analysis_cache_size: int = Field(default=128, alias="ANALYSIS_CACHE_SIZE")  # cached responses
     
     # Rate limiting
     rate_limit_requests: int = Field(default=100, alias="RATE_LIMIT_REQUESTS")
@@ -0,0 +1,18 @@
+"""Shared service instances and FastAPI dependency providers."""
+
+from functools import lru_cache
+
+from .services.analyzer_service import AnalyzerService
+from .services.github_client import GitHubClient
+
+
+@lru_cache(maxsize=None)
+def get_github_client() -> GitHubClient:
+    """Return the process-wide GitHub client."""
+    return GitHubClient()
+
+
+@lru_cache(maxsize=None)
+def get_analyzer_service() -> AnalyzerService:
+    """Return the process-wide analyzer service."""
+    return AnalyzerService(github_client=get_github_client())
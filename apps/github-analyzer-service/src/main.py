@@ -1,5 +1,6 @@
 """Main FastAPI application for GitHub repository analysis."""
 
+import asyncio
 import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
@@ -10,6 +11,7 @@ from loguru import logger
 from pydantic import BaseModel
 
 from .config import settings
+from .deps import get_analyzer_service, get_github_client
 from .routes import auth
 from .services.github_client import GitHubClient
 from .services.analyzer_service import AnalyzerService
@@ -36,9 +38,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     logger.info("🚀 Starting GitHub Analyzer Service...")
     
-    # Initialize services
-    github_client = GitHubClient()
-    analyzer_service = AnalyzerService()
+    # Initialize the shared services used by every request
+    github_client = get_github_client()
+    analyzer_service = get_analyzer_service()
+    
+    # Start from each token's real budget rather than assuming a full one; in
+    # the background, so a slow or unreachable GitHub cannot hold up startup
+    warmup = asyncio.create_task(github_client.warm_up_tokens())
     
     # Verify services
     services_status = {
@@ -51,6 +57,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
     
     logger.info("🛑 Shutting down GitHub Analyzer Service...")
+    warmup.cancel()
+    await github_client.aclose()
+    
+    # The closed client is tied to this event loop; a later lifespan in the
+    # same process (e.g. another TestClient) must build fresh services
+    get_analyzer_service.cache_clear()
+    get_github_client.cache_clear()
+    github_client = None
+    analyzer_service = None
 
 
 # Create FastAPI app
@@ -3,6 +3,7 @@
 from .repository import Repository, RepositoryAnalysis
 from .metrics import CodeMetrics, QualityMetrics, SecurityMetrics
 from .analysis import AnalysisResult, TechStack, ContributionStats
+from .responses import AnalyzeRepoResponse
 
 __all__ = [
     "Repository",
@@ -13,4 +14,5 @@ __all__ = [
     "AnalysisResult",
     "TechStack",
     "ContributionStats",
+    "AnalyzeRepoResponse",
 ]
\ No newline at end of file
@@ -1,13 +1,13 @@
 """Analysis result models."""
 
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .metrics import CodeMetrics, QualityMetrics, SecurityMetrics, PerformanceMetrics, ContributorMetrics
-from .repository import Repository
+from .repository import DiscoveredFiles, Repository
 
 
 class TechStackCategory(str, Enum):
@@ -28,6 +28,9 @@ class TechStackCategory(str, Enum):
 class TechnologyItem(BaseModel):
     """Individual technology item in the stack."""
     
+    # Immutable: analyzers merge duplicates with model_copy instead of mutating
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     name: str
     category: TechStackCategory
     version: Optional[str] = None
@@ -125,6 +128,9 @@ class AIInsights(BaseModel):
     technology_relevance: float = Field(ge=0.0, le=100.0)
     industry_alignment: List[str] = Field(default_factory=list)
     career_impact: str  # "low", "medium", "high"
+    
+    # Some assessments are fallbacks because the AI model failed
+    degraded: bool = False
 
 
 class AnalysisResult(BaseModel):
@@ -172,6 +178,9 @@ class AnalysisResult(BaseModel):
 class RepositoryAnalysis(BaseModel):
     """Simplified repository analysis result for API responses."""
     
+    # DiscoveredFiles is a plain slotted class
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
     # Repository info
     repository: Repository
     analysis_timestamp: datetime
@@ -187,5 +196,12 @@ class RepositoryAnalysis(BaseModel):
     overall_score: float = Field(ge=0.0, le=100.0)
     analysis_duration: float = 0.0  # seconds
     
+    # Contributor summary, gathered alongside the repository metadata
+    contributors_count: int = 0
+    total_commits: int = 0
+    
+    # Set when a step fell back to partial or placeholder results
+    degraded: bool = False
+    
     # Debug information
-    files_discovered: List[Dict[str, Any]] = Field(default_factory=list)
\ No newline at end of file
+    files_discovered: DiscoveredFiles = Field(default_factory=DiscoveredFiles)
\ No newline at end of file
@@ -1,14 +1,21 @@
 """Repository models for analysis."""
 
+import heapq
+from array import array
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import cached_property
+from typing import Dict, List, Optional, Any, Tuple
 
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 
 class Repository(BaseModel):
     """Repository information model."""
     
+    model_config = ConfigDict(frozen=True)
+    
     id: int
     name: str
     full_name: str
@@ -36,7 +43,7 @@ class Repository(BaseModel):
     pushed_at: Optional[datetime] = None
     
     # Additional metadata
-    topics: List[str] = Field(default_factory=list)
+    topics: Tuple[str, ...] = ()  # Immutable, so the empty default is shared
     license: Optional[str] = None
     has_issues: bool = True
     has_projects: bool = True
@@ -50,26 +57,124 @@ class Repository(BaseModel):
     analysis_version: Optional[str] = None
 
 
-class FileInfo(BaseModel):
-    """Information about a file in the repository."""
+class FileInfo(msgspec.Struct, frozen=True, kw_only=True, dict=True):
+    """Information about a file in the repository.
+    
+    Internal to the analysis pipeline and created once per fetched file, so it
+    is a msgspec struct rather than a validated Pydantic model. ``dict=True``
+    gives instances the ``__dict__`` that ``cached_property`` needs.
+    """
     
     path: str
     name: str
     extension: str
     size: int
     language: Optional[str] = None
-    content: Optional[str] = None  # Only for analysis
+    content_bytes: Optional[bytes] = None  # Raw file content, only for analysis
     sha: str
     
     # Analysis results
     lines_of_code: Optional[int] = None
     complexity: Optional[float] = None
     maintainability_index: Optional[float] = None
+    
+    @cached_property
+    def content(self) -> Optional[str]:
+        """File text, decoded from ``content_bytes`` on first access."""
+        return self.content_bytes.decode("utf-8", errors="replace") if self.content_bytes else None
+
+
+class FileInfoColumns:
+    """Column-oriented copy of a ``FileInfo`` list for whole-set aggregations.
+
+    Built once per analysis so histograms and size reductions run over flat
+    columns instead of attribute lookups on every model.
+    """
+    
+    __slots__ = ("paths", "extensions", "sizes")
+    
+    def __init__(self, paths: List[str], extensions: List[str], sizes: "array[int]"):
+        self.paths = paths
+        self.extensions = extensions
+        self.sizes = sizes
+    
+    @classmethod
+    def from_files(cls, files: List[FileInfo]) -> "FileInfoColumns":
+        """Build the columns in a single pass over ``files``."""
+        paths: List[str] = []
+        extensions: List[str] = []
+        sizes = array("q")
+        for f in files:
+            paths.append(f.path)
+            extensions.append(f.extension)
+            sizes.append(f.size)
+        return cls(paths, extensions, sizes)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def extension_counts(self) -> Dict[str, int]:
+        """Number of files per extension."""
+        return dict(Counter(self.extensions))
+    
+    def largest_paths(self, n: int = 5) -> List[str]:
+        """Paths of the ``n`` largest files, biggest first."""
+        sizes = self.sizes
+        return [self.paths[i] for i in heapq.nlargest(n, range(len(sizes)), key=sizes.__getitem__)]
+    
+    def directories(self) -> List[str]:
+        """Every directory containing a file, including their ancestors, sorted."""
+        dirs = set()
+        for path in self.paths:
+            directory = path.rpartition("/")[0]
+            # Ancestors of a known directory are already in the set
+            while directory and directory not in dirs:
+                dirs.add(directory)
+                directory = directory.rpartition("/")[0]
+        return sorted(dirs)
+
+
+class DiscoveredFiles:
+    """Every file seen during discovery, stored column-wise.
+    
+    Discovery records thousands of entries but only flips ``analyzed`` on a
+    few; records for the API are built once with ``to_records``.
+    """
+    
+    __slots__ = ("paths", "names", "analyzed")
+    
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+        self.names: List[str] = []
+        self.analyzed: List[bool] = []
+    
+    def add(self, path: str, name: str) -> int:
+        """Record a not-yet-analyzed file and return its index."""
+        self.paths.append(path)
+        self.names.append(name)
+        self.analyzed.append(False)
+        return len(self.analyzed) - 1
+    
+    def mark_analyzed(self, index: int) -> None:
+        """Flag the file at ``index`` as analyzed."""
+        self.analyzed[index] = True
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One ``{"path", "name", "analyzed"}`` dict per file, in discovery order."""
+        return [
+            {"path": path, "name": name, "analyzed": analyzed}
+            for path, name, analyzed in zip(self.paths, self.names, self.analyzed)
+        ]
 
 
 class RepositoryStructure(BaseModel):
     """Repository structure analysis."""
     
+    model_config = ConfigDict(frozen=True)
+    
     total_files: int
     total_directories: int
     file_types: Dict[str, int] = Field(default_factory=dict)
@@ -90,11 +195,15 @@ class RepositoryStructure(BaseModel):
     # Directory structure
     max_depth: int = 0
     directories: List[str] = Field(default_factory=list)
+    largest_files: List[str] = Field(default_factory=list)  # paths, biggest first
 
 
 class RepositoryAnalysis(BaseModel):
     """Complete repository analysis result."""
     
+    # FileInfo is a msgspec struct, which Pydantic accepts as an arbitrary type
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+    
     repository: Repository
     structure: RepositoryStructure
     files: List[FileInfo] = Field(default_factory=list)
@@ -109,4 +218,15 @@ class RepositoryAnalysis(BaseModel):
     # Analysis scope
     files_analyzed: int = 0
     files_skipped: int = 0
-    total_lines_analyzed: int = 0
\ No newline at end of file
+    total_lines_analyzed: int = 0
+    
+    @field_serializer("files")
+    def _serialize_files(self, files: List[FileInfo]) -> List[Dict[str, Any]]:
+        """Dump the FileInfo structs as dicts, with the decoded text as ``content``."""
+        records = []
+        for file_info in files:
+            record = msgspec.structs.asdict(file_info)
+            record["content"] = file_info.content
+            del record["content_bytes"]
+            records.append(record)
+        return records
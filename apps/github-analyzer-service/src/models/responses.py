@@ -0,0 +1,122 @@
+"""API response models."""
+
+from typing import Any, Dict, Final, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+# Placeholder texts shared by the response defaults and the response builder
+NO_AI_INSIGHTS: Final = "No AI insights available"
+NO_DETAILED_ANALYSIS: Final = "No detailed analysis available"
+NO_ARCHITECTURE_INSIGHTS: Final = "No architectural insights available"
+NO_MAINTAINABILITY_INSIGHTS: Final = "No maintainability insights available"
+NO_IMPROVEMENTS: Final = "No improvement recommendations available"
+NO_PROJECT_SUMMARY: Final = "No project summary available"
+UNKNOWN: Final = "unknown"
+
+
+class RepositoryOut(BaseModel):
+    """Repository summary returned to the client."""
+
+    full_name: str
+    description: Optional[str] = None
+    stars: int = 0
+    forks: int = 0
+    language: Optional[str] = None
+    size: int = 0
+    languages: Dict[str, int] = Field(default_factory=dict)
+
+
+class MetricsOut(BaseModel):
+    """Code metrics summary."""
+
+    lines_of_code: int = 0
+    total_lines: int = 0
+    complexity: float = 0.0
+    maintainability: float = 0.0
+    technical_debt: float = 0.0
+    files_analyzed: int = 0
+
+
+class QualityOut(BaseModel):
+    """Quality metrics summary."""
+
+    documentation_coverage: float = 0.0
+    architecture_score: float = 0.0
+    test_files: int = 0
+
+
+class SecurityOut(BaseModel):
+    """Security metrics summary."""
+
+    security_score: float = 0.0
+    critical_issues: int = 0
+    security_hotspots: int = 0
+
+
+class AIInsightsOut(BaseModel):
+    """AI insight summary."""
+
+    overall_score: float = 0.0
+    code_assessment: str = NO_AI_INSIGHTS
+    architecture_assessment: str = NO_AI_INSIGHTS
+    maintainability_assessment: str = NO_MAINTAINABILITY_INSIGHTS
+    improvement_areas: str = NO_IMPROVEMENTS
+    strengths: List[str] = Field(default_factory=list)
+    project_maturity: str = UNKNOWN
+
+
+class TechStackScoresOut(BaseModel):
+    """Summary scores for the technology stack."""
+
+    complexity: float = 0.0
+    modernness: float = 0.0
+
+
+class TechnologyStackOut(BaseModel):
+    """Technology stack as lists of names per category."""
+
+    frameworks: List[str] = Field(default_factory=list)
+    databases: List[str] = Field(default_factory=list)
+    tools: List[str] = Field(default_factory=list)
+    languages: List[str] = Field(default_factory=list)
+    testing: List[str] = Field(default_factory=list)
+    build_tools: List[str] = Field(default_factory=list)
+    deployment_tools: List[str] = Field(default_factory=list)
+    platforms: List[str] = Field(default_factory=list)
+    scores: TechStackScoresOut = Field(default_factory=TechStackScoresOut)
+
+
+class CommitAnalysisOut(BaseModel):
+    """Commit and contributor summary."""
+
+    total_commits: int = 0
+    contributors: int = 0
+    commit_frequency: str = UNKNOWN
+    latest_commit: Optional[str] = None
+
+
+class ProjectOverviewOut(BaseModel):
+    """Long-form AI analysis text."""
+
+    raw_ai_analysis: str = NO_DETAILED_ANALYSIS
+    detailed_insights: str = NO_ARCHITECTURE_INSIGHTS
+    gemini_recommendations: str = NO_MAINTAINABILITY_INSIGHTS
+
+
+class AnalyzeRepoResponse(BaseModel):
+    """Response body of ``POST /auth/analyze-repository``."""
+
+    success: bool = True
+    repository: RepositoryOut
+    metrics: MetricsOut
+    quality: QualityOut
+    security: SecurityOut
+    ai_insights: AIInsightsOut
+    technology_stack: TechnologyStackOut
+    commit_analysis: CommitAnalysisOut
+    project_overview: ProjectOverviewOut
+    overall_score: float = 0.0
+    project_summary: str = NO_PROJECT_SUMMARY
+    analysis_duration: float = 0.0
+    files_discovered: List[Dict[str, Any]] = Field(default_factory=list)
@@ -0,0 +1,107 @@
+"""Assembly of the analyze-repository response from an analysis result."""
+
+from operator import attrgetter
+
+from ..models.analysis import RepositoryAnalysis
+from ..models.responses import (
+    NO_IMPROVEMENTS,
+    AIInsightsOut,
+    AnalyzeRepoResponse,
+    CommitAnalysisOut,
+    MetricsOut,
+    ProjectOverviewOut,
+    QualityOut,
+    RepositoryOut,
+    SecurityOut,
+    TechnologyStackOut,
+    TechStackScoresOut,
+)
+
+
+_name_of = attrgetter("name")
+
+
+def build_analyze_response(
+    result: RepositoryAnalysis,
+    commit_analysis: CommitAnalysisOut,
+) -> AnalyzeRepoResponse:
+    """Project an analysis result onto the API response model.
+
+    Pure function of its inputs: no I/O, no shared state.
+    """
+    # Bind nested models once; RepositoryAnalysis always carries all of them
+    repository = result.repository
+    code_metrics = result.code_metrics
+    quality_metrics = result.quality_metrics
+    security_metrics = result.security_metrics
+    tech_stack = result.tech_stack
+    ai = result.ai_insights
+
+    # Languages breakdown by line count
+    languages_breakdown = {item.name: item.line_count for item in tech_stack.languages}
+
+    return AnalyzeRepoResponse(
+        repository=RepositoryOut(
+            full_name=repository.full_name,
+            description=repository.description,
+            stars=repository.stargazers_count,
+            forks=repository.forks_count,
+            language=repository.language,
+            size=repository.size,
+            languages=languages_breakdown,
+        ),
+        metrics=MetricsOut(
+            lines_of_code=code_metrics.lines_of_code,
+            total_lines=code_metrics.total_lines,
+            complexity=code_metrics.cyclomatic_complexity,
+            maintainability=code_metrics.maintainability_index,
+            technical_debt=code_metrics.technical_debt_ratio,
+            files_analyzed=code_metrics.total_files,
+        ),
+        quality=QualityOut(
+            documentation_coverage=quality_metrics.docstring_coverage,
+            architecture_score=quality_metrics.architecture_score,
+            test_files=quality_metrics.test_files_count,
+        ),
+        security=SecurityOut(
+            security_score=security_metrics.security_score,
+            critical_issues=security_metrics.critical_issues,
+            security_hotspots=security_metrics.security_hotspots,
+        ),
+        ai_insights=AIInsightsOut(
+            overall_score=ai.overall_quality_score,
+            code_assessment=ai.code_style_assessment,
+            architecture_assessment=ai.architecture_assessment,
+            maintainability_assessment=ai.maintainability_assessment,
+            # Map improvement areas to available fields: improvement_suggestions/weaknesses
+            improvement_areas="\n".join(ai.improvement_suggestions or ai.weaknesses)
+            or NO_IMPROVEMENTS,
+            strengths=ai.strengths,
+            project_maturity=ai.project_maturity,
+        ),
+        # Simplified technology stack (arrays of names) for the UI
+        technology_stack=TechnologyStackOut(
+            frameworks=list(map(_name_of, tech_stack.frameworks)),
+            databases=list(map(_name_of, tech_stack.databases)),
+            tools=list(map(_name_of, tech_stack.tools)),
+            languages=list(map(_name_of, tech_stack.languages)),
+            testing=list(map(_name_of, tech_stack.testing_frameworks)),
+            build_tools=list(map(_name_of, tech_stack.build_tools)),
+            deployment_tools=list(map(_name_of, tech_stack.deployment_tools)),
+            platforms=list(map(_name_of, tech_stack.platforms)),
+            scores=TechStackScoresOut(
+                complexity=tech_stack.complexity_score,
+                modernness=tech_stack.modernness_score,
+            ),
+        ),
+        commit_analysis=commit_analysis,
+        project_overview=ProjectOverviewOut(
+            raw_ai_analysis=ai.code_style_assessment,
+            detailed_insights=ai.architecture_assessment,
+            gemini_recommendations=ai.maintainability_assessment,
+        ),
+        overall_score=result.overall_score,
+        project_summary=ai.project_summary,
+        analysis_duration=result.analysis_duration,
+        files_discovered=result.files_discovered.to_records(),
+    )
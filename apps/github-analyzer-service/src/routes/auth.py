@@ -1,16 +1,37 @@
 """Authentication routes for GitHub OAuth integration."""
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional
+import hashlib
+
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
 from loguru import logger
 
+from ..config import settings
+from ..deps import get_analyzer_service, get_github_client
+from ..models.responses import AnalyzeRepoResponse, CommitAnalysisOut
 from ..services.analyzer_service import AnalyzerService
 from ..services.github_client import GitHubClient
+from ..services.ttl_cache import TTLCache
+from ._response_builder import build_analyze_response
 
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Clients may reuse an unchanged analysis briefly without asking again
+_CACHE_CONTROL = "private, max-age=60"
+
+# Plain JSON containers (lists of str/bool dicts) that orjson encodes several
+# times faster than pydantic's serializer for untyped ``Any`` values
+_ORJSON_FIELDS = frozenset({"files_discovered"})
+
+# Encoded analysis responses keyed by repository head commit
+_analysis_cache = TTLCache(ttl=settings.cache_ttl, max_entries=settings.analysis_cache_size)
+
 
 class AnalysisRequest(BaseModel):
     """Request model for repository analysis with user token."""
@@ -20,136 +41,151 @@ class AnalysisRequest(BaseModel):
     max_files: Optional[int] = 50
 
 
-@router.post("/analyze-repository")
-async def analyze_repository_with_user_token(request: AnalysisRequest):
-    """Analyze a repository using the user's GitHub token."""
+@router.post(
+    "/analyze-repository",
+    # Streamed JSON built by hand, so document the shape without validating it
+    responses={200: {"model": AnalyzeRepoResponse}},
+    # The body is parsed by hand below, so document it explicitly
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": AnalysisRequest.model_json_schema()}},
+        }
+    },
+)
+async def analyze_repository_with_user_token(
+    raw_request: Request,
+    analyzer: AnalyzerService = Depends(get_analyzer_service),
+    github_client: GitHubClient = Depends(get_github_client),
+):
+    """Analyze a repository using the user's GitHub token.
+
+    Responses are cached per head commit, so repeat requests for an unchanged
+    repository are served without re-running the analysis pipeline. Completed
+    analyses carry an ETag; sending it back in If-None-Match yields a 304.
+    """
+    request = await _parse_analysis_request(raw_request)
     try:
         logger.info(f"Analyzing {request.owner}/{request.repo} with user token")
-        
-        # Initialize analyzer service
-        analyzer = AnalyzerService()
-        
-        # Perform analysis with user's token
-        result = await analyzer.analyze_repository_simple(
-            owner=request.owner,
-            repo=request.repo,
-            access_token=request.access_token,
-            max_files=request.max_files
-        )
-        
-        # Build languages breakdown from tech stack if available
-        languages_breakdown = {}
-        try:
-            if result.tech_stack and result.tech_stack.languages:
-                languages_breakdown = {
-                    item.name: item.line_count for item in result.tech_stack.languages if getattr(item, 'line_count', None) is not None
-                }
-        except Exception as e:
-            logger.warning(f"Failed to build languages breakdown: {e}")
-
-        # Build simplified technology stack (arrays of names) - extended to include more categories
-        simple_tech_stack = {
-            "frameworks": [t.name for t in (result.tech_stack.frameworks or [])] if result.tech_stack else [],
-            "databases": [t.name for t in (result.tech_stack.databases or [])] if result.tech_stack else [],
-            "tools": [t.name for t in (result.tech_stack.tools or [])] if result.tech_stack else [],
-            "languages": [t.name for t in (result.tech_stack.languages or [])] if result.tech_stack else [],
-            # New categories exposed for UI
-            "testing": [t.name for t in (getattr(result.tech_stack, 'testing_frameworks', []) or [])] if result.tech_stack else [],
-            "build_tools": [t.name for t in (getattr(result.tech_stack, 'build_tools', []) or [])] if result.tech_stack else [],
-            "deployment_tools": [t.name for t in (getattr(result.tech_stack, 'deployment_tools', []) or [])] if result.tech_stack else [],
-            "platforms": [t.name for t in (getattr(result.tech_stack, 'platforms', []) or [])] if result.tech_stack else [],
-            # Optional summary scores for future UI use
-            "scores": {
-                "complexity": getattr(result.tech_stack, 'complexity_score', 0.0) if result.tech_stack else 0.0,
-                "modernness": getattr(result.tech_stack, 'modernness_score', 0.0) if result.tech_stack else 0.0,
-            }
-        }
 
-        # Compute commit analysis (total commits and contributors)
-        commit_analysis = {
-            "total_commits": 0,
-            "contributors": 0,
-            "commit_frequency": "unknown",
-            "latest_commit": None,
-        }
-        try:
-            gh = GitHubClient()
-            if request.access_token:
-                gh.token = request.access_token
-                gh.headers = gh._build_headers()
-
-            contributors = await gh.get_repository_contributors(request.owner, request.repo)
-            commit_analysis["contributors"] = len(contributors) if contributors else 0
-            total_commits = 0
-            if contributors:
-                for c in contributors:
-                    total_commits += int(c.get("contributions", 0))
-            commit_analysis["total_commits"] = total_commits
-
-            # Get latest commit timestamp (lightweight)
-            commits_latest = await gh.get_repository_commits(request.owner, request.repo, per_page=1, max_pages=1)
-            if commits_latest:
-                commit = commits_latest[0]
-                commit_analysis["latest_commit"] = commit.get("commit", {}).get("author", {}).get("date")
-        except Exception as e:
-            logger.warning(f"Failed to compute commit analysis: {e}")
-
-        return {
-            "success": True,
-            "repository": {
-                "full_name": result.repository.full_name,
-                "description": result.repository.description,
-                "stars": result.repository.stargazers_count,
-                "forks": result.repository.forks_count,
-                "language": result.repository.language,
-                "size": result.repository.size,
-                "languages": languages_breakdown,
-            },
-            "metrics": {
-                "lines_of_code": result.code_metrics.lines_of_code,
-                "total_lines": result.code_metrics.total_lines,
-                "complexity": result.code_metrics.cyclomatic_complexity,
-                "maintainability": result.code_metrics.maintainability_index,
-                "technical_debt": result.code_metrics.technical_debt_ratio,
-                "files_analyzed": result.code_metrics.total_files,
-            },
-            "quality": {
-                "documentation_coverage": result.quality_metrics.docstring_coverage,
-                "architecture_score": result.quality_metrics.architecture_score,
-                "test_files": result.quality_metrics.test_files_count,
-            },
-            "security": {
-                "security_score": result.security_metrics.security_score,
-                "critical_issues": result.security_metrics.critical_issues,
-                "security_hotspots": result.security_metrics.security_hotspots,
-            },
-            "ai_insights": {
-                "overall_score": result.ai_insights.overall_quality_score if result.ai_insights else 0,
-                "code_assessment": result.ai_insights.code_style_assessment if result.ai_insights else "No AI insights available",
-                "architecture_assessment": result.ai_insights.architecture_assessment if result.ai_insights else "No AI insights available",
-                "maintainability_assessment": result.ai_insights.maintainability_assessment if result.ai_insights else "No maintainability insights available",
-                # Map improvement areas to available fields: improvement_suggestions/weaknesses
-                "improvement_areas": ("\n".join(result.ai_insights.improvement_suggestions) if getattr(result.ai_insights, 'improvement_suggestions', None) else None) or 
-                                      ("\n".join(result.ai_insights.weaknesses) if getattr(result.ai_insights, 'weaknesses', None) else "No improvement recommendations available"),
-                "strengths": result.ai_insights.strengths if result.ai_insights else [],
-                "project_maturity": result.ai_insights.project_maturity if result.ai_insights else "unknown",
-            },
-            "technology_stack": simple_tech_stack,
-            "commit_analysis": commit_analysis,
-            "project_overview": {
-                "raw_ai_analysis": result.ai_insights.code_style_assessment if result.ai_insights else "No detailed analysis available",
-                "detailed_insights": result.ai_insights.architecture_assessment if result.ai_insights else "No architectural insights available",
-                "gemini_recommendations": result.ai_insights.maintainability_assessment if result.ai_insights else "No maintainability insights available",
-            },
-            "overall_score": result.overall_score,
-            "project_summary": result.ai_insights.project_summary if result.ai_insights else "No project summary available",
-            "analysis_duration": result.analysis_duration,
-            "files_discovered": result.files_discovered,
-        }
-        
+        # The head commit keys the cache and doubles as the latest commit info
+        latest_commit = await github_client.get_head_commit(request.owner, request.repo, request.access_token)
+        head_sha = latest_commit.get("sha") if latest_commit else None
+
+        if not head_sha:
+            response, _ = await _build_analysis_payload(request, analyzer, latest_commit)
+            return _streaming_json_response(response)
+
+        cache_key = f"{request.owner.lower()}/{request.repo.lower()}@{head_sha}:{request.max_files}"
+        # Hash the whole key: forks share commit SHAs with their parent
+        etag = f'W/"{hashlib.sha1(cache_key.encode()).hexdigest()}"'
+        cache_headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+        if _etag_matches(raw_request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        cached = _analysis_cache.get(cache_key)
+        if cached is None:
+            # Concurrent identical requests wait here for the first analysis
+            async with _analysis_cache.lock(cache_key):
+                cached = _analysis_cache.get(cache_key)
+                if cached is None:
+                    response, complete = await _build_analysis_payload(request, analyzer, latest_commit)
+                    if not complete:
+                        return _streaming_json_response(response)
+                    cached = b"".join(_response_json_chunks(response))
+                    _analysis_cache.set(cache_key, cached)
+                    return Response(content=cached, media_type="application/json", headers=cache_headers)
+
+        logger.info(f"Serving cached analysis for {cache_key}")
+        return Response(content=cached, media_type="application/json", headers=cache_headers)
+
     except Exception as e:
         logger.error(f"Repository analysis failed: {e}")
         raise HTTPException(
             status_code=400,
             detail=f"Analysis failed: {str(e)}"
         )
+
+
+async def _parse_analysis_request(raw_request: Request) -> AnalysisRequest:
+    """Parse and validate the body in one pydantic-core pass.
+
+    Errors are re-raised as FastAPI's RequestValidationError so clients keep
+    getting the usual 422 response.
+    """
+    try:
+        return AnalysisRequest.model_validate_json(await raw_request.body())
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        for error in errors:
+            error["loc"] = ("body", *error["loc"])
+        raise RequestValidationError(errors)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _streaming_json_response(
+    response: AnalyzeRepoResponse, headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """Stream the response JSON one top-level field at a time."""
+    return StreamingResponse(_iter_response_json(response), media_type="application/json", headers=headers)
+
+
+async def _iter_response_json(response: AnalyzeRepoResponse) -> AsyncIterator[bytes]:
+    """Stream ``_response_json_chunks``.
+
+    Early fields go out while large ones such as ``files_discovered`` and
+    the AI assessments are still being serialized.
+    """
+    for chunk in _response_json_chunks(response):
+        yield chunk
+
+
+def _response_json_chunks(response: AnalyzeRepoResponse) -> Iterator[bytes]:
+    """Yield the same JSON as ``response.model_dump_json()`` in per-field chunks."""
+    yield b"{"
+    for i, name in enumerate(AnalyzeRepoResponse.model_fields):
+        if name in _ORJSON_FIELDS:
+            fragment = b'"' + name.encode() + b'":' + orjson.dumps(getattr(response, name))
+        else:
+            # '{"name":value}' -> '"name":value'
+            fragment = response.model_dump_json(include={name})[1:-1].encode()
+        yield b"," + fragment if i else fragment
+    yield b"}"
+
+
+async def _build_analysis_payload(
+    request: AnalysisRequest,
+    analyzer: AnalyzerService,
+    latest_commit: Optional[Dict[str, Any]],
+) -> Tuple[AnalyzeRepoResponse, bool]:
+    """Run the analysis and build the response model.
+
+    Returns the response and whether the analysis completed without falling
+    back anywhere (and may be cached).
+    """
+    # Perform analysis with user's token
+    result = await analyzer.analyze_repository_simple(
+        owner=request.owner,
+        repo=request.repo,
+        access_token=request.access_token,
+        max_files=request.max_files
+    )
+
+    # The analyzer already fetched contributors; the head commit came from the route
+    commit_analysis = CommitAnalysisOut(
+        contributors=result.contributors_count,
+        total_commits=result.total_commits,
+        latest_commit=latest_commit.get("commit", {}).get("author", {}).get("date") if latest_commit else None,
+    )
+
+    response = build_analyze_response(result, commit_analysis)
+    return response, not result.degraded
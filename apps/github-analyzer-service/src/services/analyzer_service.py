@@ -1,11 +1,16 @@
 """Main analyzer service that orchestrates repository analysis."""
 
+import asyncio
+import heapq
+import re
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 
 from loguru import logger
 
-from ..models.repository import Repository, RepositoryStructure, FileInfo
+from ..config import settings
+from ..models.repository import Repository, RepositoryStructure, FileInfo, FileInfoColumns, DiscoveredFiles
 from ..models.analysis import RepositoryAnalysis
 from ..models.analysis import TechStack, AIInsights
 from ..models.metrics import CodeMetrics, QualityMetrics, SecurityMetrics
@@ -13,14 +18,155 @@ from ..analyzers.code_analyzer import CodeAnalyzer
 from ..analyzers.tech_stack_analyzer import TechStackAnalyzer
 from ..analyzers.security_analyzer import SecurityAnalyzer
 from ..analyzers.ai_insights_analyzer import AIInsightsAnalyzer
-from .github_client import GitHubClient
+from .github_client import GitHubClient, token_scope
+
+
+# File extensions worth analyzing for code metrics
+_ANALYZABLE_EXTENSIONS = frozenset({
+    # Popular programming languages
+    'py', 'js', 'ts', 'jsx', 'tsx', 'java', 'cpp', 'c', 'cs', 'go', 
+    'rs', 'php', 'rb', 'swift', 'kt', 'scala', 'r', 'sql', 'sh', 
+    'bash', 'ps1', 'pl', 'lua', 'dart', 'vue', 'svelte',
+    
+    # Additional languages and file types
+    'h', 'hpp', 'cc', 'cxx', 'm', 'mm', 'groovy', 'gradle',
+    'clj', 'cljs', 'elm', 'ex', 'exs', 'erl', 'hrl', 'hs',
+    'ml', 'mli', 'fs', 'fsx', 'fsi', 'nim', 'nims', 'pas',
+    'pp', 'pro', 'vb', 'vbs', 'asm', 's', 'f', 'f90', 'f95',
+    'jl', 'd', 'zig', 'odin', 'v', 'vv',
+    
+    # Web and markup (some have logic)
+    'html', 'htm', 'xml', 'xsl', 'xslt', 'svg',
+    
+    # Configuration files with logic
+    'dockerfile', 'makefile', 'cmake', 'yml', 'yaml', 'toml',
+    'ini', 'cfg', 'conf', 'properties', 'json', 'tf', 'hcl'
+})
+
+# Path patterns excluded from analysis (matched case-insensitively)
+_SKIP_PATH_PATTERNS: Tuple[str, ...] = (
+    # Build and dependency directories
+    'node_modules/', '__pycache__/', '.git/', 'venv/', 'env/',
+    'build/', 'dist/', 'target/', 'bin/', 'obj/', '.vscode/',
+    '.idea/', '.gradle/', 'vendor/', 'bower_components/',
+    
+    # Test directories (we'll analyze some but not all)
+    'coverage/', '.coverage/', '.pytest_cache/', '.nyc_output/',
+    
+    # Documentation that's not core code
+    'docs/', 'documentation/', 'examples/tutorials/',
+    
+    # Common non-code directories
+    'assets/', 'static/', 'public/', 'images/', 'img/', 
+    'fonts/', 'stylesheets/', 'css/', 'scss/', 'sass/',
+    
+    # Package manager files we don't need to analyze deeply
+    '.npm/', '.yarn/', 'yarn.lock', 'package-lock.json',
+    
+    # Hidden directories
+    '.github/', '.gitlab/', '.circleci/', '.travis/'
+)
+
+# Any skip pattern following a '/' anywhere in the path
+_SKIP_PATH_INNER = re.compile("/(?:" + "|".join(map(re.escape, _SKIP_PATH_PATTERNS)) + ")")
+
+
+# Files above this size (often generated or minified) are fetched only once
+# every smaller candidate has been
+_LARGE_FILE_SIZE = 100 * 1024
+
+
+# Directory names never explored during file discovery (matched per path part)
+_SKIP_DIRS = frozenset({
+    # Version control
+    '.git', '.svn', '.hg',
+    
+    # Dependencies and build outputs
+    'node_modules', '__pycache__', '.pytest_cache', 'venv', 'env', 
+    'virtualenv', '.venv', '.env', 'build', 'dist', 'target', 'bin', 
+    'obj', 'out', '.gradle', 'vendor', 'bower_components', '.npm',
+    
+    # IDE and editor files
+    '.vscode', '.idea', '.vs', '.settings', '.project', '.classpath',
+    
+    # Documentation and examples (too many files, often not core code)
+    'docs', 'documentation', 'examples', 'samples', 'demo', 'demos',
+    'test-data', 'testdata', 'fixtures', 'mocks',
+    
+    # Static assets
+    'assets', 'static', 'public', 'images', 'img', 'fonts', 
+    'stylesheets', 'css', 'scss', 'sass', 'media',
+    
+    # Coverage and test outputs
+    'coverage', '.coverage', '.nyc_output', 'htmlcov', 'test-results',
+    
+    # Temporary and cache directories
+    'tmp', 'temp', 'cache', '.cache', 'logs', 'log',
+    
+    # Package manager artifacts
+    'yarn.lock', 'package-lock.json', 'Pipfile.lock', 'poetry.lock',
+    
+    # Hidden directories (except some important ones)
+    '.github', '.gitlab', '.circleci', '.travis', '.appveyor'
+})
+
+
+def _failed_repository(owner: str, repo: str) -> Repository:
+    """Placeholder repository (id 0) reported when an analysis fails."""
+    return Repository(
+        id=0,
+        name=repo,
+        full_name=f"{owner}/{repo}",
+        description="Analysis failed",
+        url=f"https://github.com/{owner}/{repo}",
+        html_url=f"https://github.com/{owner}/{repo}",
+        clone_url=f"https://github.com/{owner}/{repo}.git",
+        ssh_url=f"git@github.com:{owner}/{repo}.git",
+        language=None,
+        stargazers_count=0,
+        watchers_count=0,
+        forks_count=0,
+        open_issues_count=0,
+        size=0,
+        default_branch="main",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+        pushed_at=datetime.now(),
+        is_private=False,
+        is_fork=False,
+        is_archived=False,
+        is_disabled=False,
+        has_issues=False,
+        has_projects=False,
+        has_wiki=False,
+        has_pages=False,
+        has_downloads=False,
+        topics=[],
+        languages={}
+    )
+
+
+# Insights reported when an analysis fails; copied with the error message
+_FAILED_AI_INSIGHTS = AIInsights(
+    overall_quality_score=0.0,
+    code_style_assessment="Analysis failed",
+    architecture_assessment="Analysis failed",
+    maintainability_assessment="Analysis failed",
+    project_summary="Analysis failed - unable to generate project summary",
+    best_practices_adherence=0.0,
+    project_maturity="unknown",
+    development_stage="unknown",
+    maintenance_burden="unknown",
+    technology_relevance=0.0,
+    career_impact="unknown"
+)
 
 
 class AnalyzerService:
     """Main service for analyzing repositories."""
     
-    def __init__(self):
-        self.github_client = GitHubClient()
+    def __init__(self, github_client: Optional[GitHubClient] = None):
+        self.github_client = github_client or GitHubClient()
         self.code_analyzer = CodeAnalyzer()
         self.tech_stack_analyzer = TechStackAnalyzer()
         self.security_analyzer = SecurityAnalyzer()
@@ -36,102 +182,144 @@ class AnalyzerService:
         max_files: int = 200
     ) -> RepositoryAnalysis:
         """Simple repository analysis that returns RepositoryAnalysis."""
+        # Scope the caller's token to this task; the shared client is never mutated
+        with token_scope(access_token):
+            return await self._analyze_repository_simple(owner, repo, max_files)
+    
+    async def _analyze_repository_simple(
+        self, 
+        owner: str, 
+        repo: str,
+        max_files: int
+    ) -> RepositoryAnalysis:
         start_time = datetime.now()
         
         logger.info(f"Starting simple analysis for {owner}/{repo}")
         
-        # Initialize files_discovered to avoid attribute errors
-        files_discovered = []
-        
-        # Set access token if provided
-        original_token = self.github_client.token
-        if access_token:
-            self.github_client.token = access_token
-            self.github_client.headers = self.github_client._build_headers()
+        # Initialize files_discovered and contributor stats to avoid attribute errors
+        files_discovered = DiscoveredFiles()
+        contributors_count = 0
+        total_commits = 0
         
         try:
             
-            # Get basic repository information
-            repository = await self.github_client.get_repository(owner, repo)
-            
-            # Get language statistics
-            languages = await self.github_client.get_repository_languages(owner, repo)
+            # Repository info with language statistics, and contributors, are
+            # independent; contribution counts are only available over REST
+            bundle, contributors = await asyncio.gather(
+                self.github_client.fetch_repo_bundle(owner, repo),
+                self.github_client.get_repository_contributors(owner, repo),
+                return_exceptions=True,
+            )
+            if isinstance(contributors, list):
+                contributors_count = len(contributors)
+                # GitHub reports contributions as integers already
+                total_commits = sum(c.get("contributions", 0) for c in contributors)
+            if isinstance(bundle, BaseException):
+                raise bundle
+            repository, languages = bundle
             
             # Get ALL files using recursive directory traversal
             files = []
-            files_discovered = []
+            files_discovered = DiscoveredFiles()
+            discovery_failed = False
             try:
                 logger.info(f"Starting complete recursive file discovery for {owner}/{repo}")
                 
                 # Get all files recursively from the entire repository
-                all_files = await self._discover_all_files_recursively(owner, repo, max_files)
+                all_files = await self._discover_all_files_recursively(
+                    owner, repo, max_files, ref=repository.default_branch
+                )
                 
                 logger.info(f"Discovered {len(all_files)} total files, processing analyzable ones...")
                 
-                file_count = 0
                 analyzed_files = []
+                candidates = []
                 
                 for file_item in all_files:
                     # Track all discovered files for debugging
-                    files_discovered.append({
-                        "path": file_item["path"],
-                        "name": file_item["name"],
-                        "analyzed": False
-                    })
-                    
-                    if file_count >= max_files:
-                        continue
+                    discovered = files_discovered.add(file_item["path"], file_item["name"])
                     
                     # Check if file should be analyzed
                     extension = self._get_file_extension(file_item["name"]).lower()
                     
                     if self._should_skip_path(file_item["path"]):
                         continue
-                        
+                    
+                    # Listed sizes let oversized (usually generated) files be
+                    # dropped before their content is downloaded
+                    if file_item.get("size", 0) > settings.max_file_size:
+                        logger.debug(f"Skipping large file: {file_item['path']} ({file_item['size']} bytes)")
+                        continue
+                    
                     if self._is_analyzable_file(extension):
-                        logger.info(f"Fetching content for {file_item['path']} ({extension})")
-                        
-                        try:
-                            file_content = await self.github_client.get_file_content(owner, repo, file_item["path"])
-                            
-                            if file_content:
-                                file_info = FileInfo(
-                                    path=file_item["path"],
-                                    name=file_item["name"],
-                                    extension=extension,
-                                    size=file_item.get("size", 0),
-                                    content=file_content,
-                                    sha=file_item.get("sha", "")
-                                )
-                                files.append(file_info)
-                                analyzed_files.append(file_item["path"])
-                                
-                                # Mark this file as analyzed in our discovery list
-                                files_discovered[-1]["analyzed"] = True
-                                file_count += 1
-                            else:
-                                logger.warning(f"No content retrieved for {file_item['path']}")
-                                
-                        except Exception as e:
-                            logger.warning(f"Failed to fetch content for {file_item['path']}: {e}")
+                        candidates.append((file_item, extension, discovered))
+                
+                # Stable sort: discovery order otherwise, large files last
+                candidates.sort(key=lambda candidate: candidate[0].get("size", 0) > _LARGE_FILE_SIZE)
+                
+                # Fetch contents concurrently in candidate order. Each wave only
+                # requests as many files as are still missing, so failed fetches
+                # are backfilled by the next candidates up to max_files. The
+                # client caps how many requests are in flight.
+                async def fetch_content(file_item: Dict[str, Any]) -> Optional[bytes]:
+                    logger.info(f"Fetching content for {file_item['path']}")
+                    # Tree and contents entries both carry the blob SHA
+                    if file_item.get("sha"):
+                        return await self.github_client.get_blob_content(owner, repo, file_item["sha"])
+                    return await self.github_client.get_file_content(owner, repo, file_item["path"])
+                
+                next_candidate = 0
+                while next_candidate < len(candidates) and len(files) < max_files:
+                    wave = candidates[next_candidate:next_candidate + max_files - len(files)]
+                    next_candidate += len(wave)
+                    contents = await asyncio.gather(
+                        *(fetch_content(file_item) for file_item, _, _ in wave),
+                        return_exceptions=True,
+                    )
+                    
+                    for (file_item, extension, discovered), file_content in zip(wave, contents):
+                        if isinstance(file_content, BaseException):
+                            logger.warning(f"Failed to fetch content for {file_item['path']}: {file_content}")
+                            continue
+                        if not file_content:
+                            logger.warning(f"No content retrieved for {file_item['path']}")
                             continue
+                        
+                        files.append(FileInfo(
+                            path=file_item["path"],
+                            name=file_item["name"],
+                            extension=extension,
+                            size=file_item.get("size", 0),
+                            content_bytes=file_content,
+                            sha=file_item.get("sha", "")
+                        ))
+                        analyzed_files.append(file_item["path"])
+                        
+                        # Mark this file as analyzed in our discovery list
+                        files_discovered.mark_analyzed(discovered)
                 
                 logger.info(f"Successfully fetched content for {len(files)} files from recursive discovery")
                 logger.info(f"Analyzed files: {analyzed_files}")
             except Exception as e:
                 logger.warning(f"Could not fetch repository contents: {e}")
+                discovery_failed = True
             
             # Create basic structure
+            columns = FileInfoColumns.from_files(files)
+            directories = columns.directories()
             structure = RepositoryStructure(
-                total_files=len(files),
-                total_directories=0,  # We're only looking at root files
-                directories=[],
-                file_types={},
-                largest_files=files[:5]
+                total_files=len(columns),
+                total_directories=len(directories),  # Directories holding fetched files
+                directories=directories,
+                file_types=columns.extension_counts(),
+                largest_files=columns.largest_paths(5)
             )
             
-            # Run basic analyzers
+            # Run basic analyzers; they are CPU-bound and never wait on I/O,
+            # so running them together would not overlap any work
             code_metrics = await self.code_analyzer.analyze_code_metrics(files)
+            security_metrics = await self.security_analyzer.analyze_security(files, structure)
+            tech_stack = await self.tech_stack_analyzer.analyze_tech_stack(files, languages)
             
             quality_metrics = QualityMetrics(
                 architecture_score=70.0,  # Default score
@@ -139,10 +327,6 @@ class AnalyzerService:
                 test_to_code_ratio=0.2
             )
             
-            security_metrics = await self.security_analyzer.analyze_security(files, structure)
-            
-            tech_stack = await self.tech_stack_analyzer.analyze_tech_stack(files, structure, languages)
-            
             ai_insights = await self.ai_insights_analyzer.generate_insights(
                 repository, code_metrics, quality_metrics, security_metrics, tech_stack, files
             )
@@ -150,10 +334,6 @@ class AnalyzerService:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
-            # Restore original token
-            self.github_client.token = original_token
-            self.github_client.headers = self.github_client._build_headers()
-            
             return RepositoryAnalysis(
                 repository=repository,
                 analysis_timestamp=end_time,
@@ -164,13 +344,13 @@ class AnalyzerService:
                 ai_insights=ai_insights,
                 overall_score=ai_insights.overall_quality_score,
                 analysis_duration=duration,
-                files_discovered=files_discovered
+                degraded=discovery_failed or not files or ai_insights.degraded,
+                files_discovered=files_discovered,
+                contributors_count=contributors_count,
+                total_commits=total_commits
             )
             
         except Exception as e:
-            # Restore original token on error
-            self.github_client.token = original_token
-            self.github_client.headers = self.github_client._build_headers()
             logger.error(f"Simple analysis failed for {owner}/{repo}: {e}")
             
             # Return a failed analysis result instead of raising exception
@@ -178,128 +358,42 @@ class AnalyzerService:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
-            # Create a minimal failed repository object
-            failed_repository = Repository(
-                id=0,
-                name=repo,
-                full_name=f"{owner}/{repo}",
-                description="Analysis failed",
-                url=f"https://github.com/{owner}/{repo}",
-                html_url=f"https://github.com/{owner}/{repo}",
-                clone_url=f"https://github.com/{owner}/{repo}.git",
-                ssh_url=f"git@github.com:{owner}/{repo}.git",
-                language=None,
-                stargazers_count=0,
-                watchers_count=0,
-                forks_count=0,
-                open_issues_count=0,
-                size=0,
-                default_branch="main",
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
-                pushed_at=datetime.now(),
-                is_private=False,
-                is_fork=False,
-                is_archived=False,
-                is_disabled=False,
-                has_issues=False,
-                has_projects=False,
-                has_wiki=False,
-                has_pages=False,
-                has_downloads=False,
-                topics=[],
-                languages={}
-            )
-            
             return RepositoryAnalysis(
-                repository=failed_repository,
+                repository=_failed_repository(owner, repo),
                 analysis_timestamp=end_time,
                 code_metrics=CodeMetrics(),
                 quality_metrics=QualityMetrics(),
                 security_metrics=SecurityMetrics(),
                 tech_stack=TechStack(),
-                ai_insights=AIInsights(
-                    overall_quality_score=0.0,
-                    code_style_assessment=f"Analysis failed: {str(e)}",
-                    architecture_assessment="Analysis failed",
-                    maintainability_assessment="Analysis failed",
-                    project_summary="Analysis failed - unable to generate project summary",
-                    best_practices_adherence=0.0,
-                    project_maturity="unknown",
-                    development_stage="unknown",
-                    maintenance_burden="unknown",
-                    technology_relevance=0.0,
-                    career_impact="unknown"
+                ai_insights=_FAILED_AI_INSIGHTS.model_copy(
+                    update={"code_style_assessment": f"Analysis failed: {str(e)}"}
                 ),
                 overall_score=0.0,
                 analysis_duration=duration,
-                files_discovered=files_discovered
+                degraded=True,
+                files_discovered=files_discovered,
+                contributors_count=contributors_count,
+                total_commits=total_commits
             )
     
-    def _is_analyzable_file(self, extension: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_analyzable_file(extension: str) -> bool:
         """Check if file extension is worth analyzing for code metrics."""
-        analyzable_extensions = {
-            # Popular programming languages
-            'py', 'js', 'ts', 'jsx', 'tsx', 'java', 'cpp', 'c', 'cs', 'go', 
-            'rs', 'php', 'rb', 'swift', 'kt', 'scala', 'r', 'sql', 'sh', 
-            'bash', 'ps1', 'pl', 'lua', 'dart', 'vue', 'svelte',
-            
-            # Additional languages and file types
-            'h', 'hpp', 'cc', 'cxx', 'm', 'mm', 'groovy', 'gradle',
-            'clj', 'cljs', 'elm', 'ex', 'exs', 'erl', 'hrl', 'hs',
-            'ml', 'mli', 'fs', 'fsx', 'fsi', 'nim', 'nims', 'pas',
-            'pp', 'pro', 'vb', 'vbs', 'asm', 's', 'f', 'f90', 'f95',
-            'jl', 'd', 'zig', 'odin', 'v', 'vv',
-            
-            # Web and markup (some have logic)
-            'html', 'htm', 'xml', 'xsl', 'xslt', 'svg',
-            
-            # Configuration files with logic
-            'dockerfile', 'makefile', 'cmake', 'yml', 'yaml', 'toml',
-            'ini', 'cfg', 'conf', 'properties', 'json', 'tf', 'hcl'
-        }
-        return extension.lower() in analyzable_extensions
+        return extension.lower() in _ANALYZABLE_EXTENSIONS
     
     def _should_skip_path(self, path: str) -> bool:
         """Check if we should skip this file path during analysis."""
-        skip_patterns = {
-            # Build and dependency directories
-            'node_modules/', '__pycache__/', '.git/', 'venv/', 'env/',
-            'build/', 'dist/', 'target/', 'bin/', 'obj/', '.vscode/',
-            '.idea/', '.gradle/', 'vendor/', 'bower_components/',
-            
-            # Test directories (we'll analyze some but not all)
-            'coverage/', '.coverage/', '.pytest_cache/', '.nyc_output/',
-            
-            # Documentation that's not core code
-            'docs/', 'documentation/', 'examples/tutorials/',
-            
-            # Common non-code directories
-            'assets/', 'static/', 'public/', 'images/', 'img/', 
-            'fonts/', 'stylesheets/', 'css/', 'scss/', 'sass/',
-            
-            # Package manager files we don't need to analyze deeply
-            '.npm/', '.yarn/', 'yarn.lock', 'package-lock.json',
-            
-            # Hidden directories
-            '.github/', '.gitlab/', '.circleci/', '.travis/'
-        }
-        
         path_lower = path.lower()
-        
-        # Check if path starts with any skip pattern
-        for pattern in skip_patterns:
-            if path_lower.startswith(pattern) or f'/{pattern}' in path_lower:
-                return True
-                
-        # Skip files that are too large (over 100KB) - likely generated
-        return False
+        # A skip pattern at the start of the path or right after any '/'
+        return path_lower.startswith(_SKIP_PATH_PATTERNS) or _SKIP_PATH_INNER.search(path_lower) is not None
     
-    def _get_file_extension(self, filename: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_file_extension(filename: str) -> str:
         """Get file extension."""
-        if "." in filename:
-            return filename.split(".")[-1]
-        return ""
+        _, dot, extension = filename.rpartition(".")
+        return extension if dot else ""
     
     def _detect_file_language(self, filename: str, extension: str) -> Optional[str]:
         """Detect programming language from file extension."""
@@ -339,100 +433,132 @@ class AnalyzerService:
         return ext_map.get(extension.lower())
     
     
-    async def _discover_all_files_recursively(self, owner: str, repo: str, max_files: int = 2000) -> List[Dict[str, Any]]:
-        """Recursively discover ALL files in the repository structure."""
-        all_files = []
-        directories_to_explore = [""]  # Start with root directory
-        processed_paths = set()
+    async def _discover_all_files_recursively(
+        self, owner: str, repo: str, max_files: int = 2000, ref: str = "HEAD"
+    ) -> List[Dict[str, Any]]:
+        """Discover ALL files in the repository from a single recursive tree.
         
-        logger.info(f"Starting recursive file discovery for {owner}/{repo}")
+        Falls back to listing directories one by one when the tree cannot be
+        fetched or GitHub truncated it.
+        """
+        try:
+            tree = await self.github_client.get_repository_tree(owner, repo, ref)
+        except Exception as e:
+            logger.warning(f"Could not fetch tree for {owner}/{repo}, listing directories instead: {e}")
+            return await self._discover_files_by_listing(owner, repo, max_files)
         
-        while directories_to_explore and len(all_files) < max_files * 3:  # Explore more for filtering
-            current_path = directories_to_explore.pop(0)
-            
-            if current_path in processed_paths:
+        if tree.get("truncated"):
+            logger.warning(f"Tree for {owner}/{repo} is truncated, listing directories instead")
+            return await self._discover_files_by_listing(owner, repo, max_files)
+        
+        all_files = []
+        for entry in tree.get("tree", []):
+            if entry["type"] != "blob":
                 continue
-            processed_paths.add(current_path)
-            
-            try:
-                logger.debug(f"Exploring directory: '{current_path or 'root'}'")
-                
-                # Get contents of current directory
-                contents = await self.github_client.get_repository_contents(
-                    owner, repo, current_path, recursive=False
-                )
-                
-                for item in contents:
-                    if item["type"] == "file":
-                        # Add file to our list
-                        all_files.append(item)
-                        
-                    elif item["type"] == "dir":
-                        # Skip certain directories to avoid infinite loops and irrelevant content
-                        if not self._should_skip_directory(item["path"]):
-                            directories_to_explore.append(item["path"])
-                        else:
-                            logger.debug(f"Skipping directory: {item['path']}")
-                
-                # Sort files by priority (code files first, then by depth)
-                all_files.sort(key=lambda f: (
-                    0 if self._is_analyzable_file(self._get_file_extension(f["name"]).lower()) else 1,
-                    f["path"].count("/"),  # Prefer files in shallower directories
-                    f["name"]
-                ))
-                
-            except Exception as e:
-                logger.warning(f"Failed to fetch directory '{current_path}': {e}")
+            path = entry["path"]
+            directory, _, name = path.rpartition("/")
+            # Same directories the listing walk would not descend into
+            if directory and self._should_skip_directory(directory):
                 continue
+            # Shaped like a contents API item so callers can use either source
+            all_files.append({
+                "name": name,
+                "path": path,
+                "sha": entry["sha"],
+                "size": entry.get("size", 0),
+                "type": "file",
+            })
         
-        # Limit the number of files returned
-        limited_files = all_files[:max_files * 2]  # Get more files for better filtering
+        return self._top_priority_files(all_files, max_files)
+    
+    def _top_priority_files(self, all_files: List[Dict[str, Any]], max_files: int) -> List[Dict[str, Any]]:
+        """Return the highest-priority files, keeping extras for later filtering."""
+        # Only the head of the order is kept, so select it rather than sorting
+        # everything; nsmallest is stable like sorted()[:n]
+        limited_files = heapq.nsmallest(max_files * 2, all_files, key=self._file_priority)
         
         logger.info(f"Discovered {len(all_files)} total files, returning top {len(limited_files)} for analysis")
         logger.debug(f"Sample discovered files: {[f['path'] for f in limited_files[:10]]}")
         
         return limited_files
     
-    def _should_skip_directory(self, dir_path: str) -> bool:
-        """Check if we should skip exploring this directory."""
-        skip_dirs = {
-            # Version control
-            '.git', '.svn', '.hg',
-            
-            # Dependencies and build outputs
-            'node_modules', '__pycache__', '.pytest_cache', 'venv', 'env', 
-            'virtualenv', '.venv', '.env', 'build', 'dist', 'target', 'bin', 
-            'obj', 'out', '.gradle', 'vendor', 'bower_components', '.npm',
-            
-            # IDE and editor files
-            '.vscode', '.idea', '.vs', '.settings', '.project', '.classpath',
-            
-            # Documentation and examples (too many files, often not core code)
-            'docs', 'documentation', 'examples', 'samples', 'demo', 'demos',
-            'test-data', 'testdata', 'fixtures', 'mocks',
-            
-            # Static assets
-            'assets', 'static', 'public', 'images', 'img', 'fonts', 
-            'stylesheets', 'css', 'scss', 'sass', 'media',
-            
-            # Coverage and test outputs
-            'coverage', '.coverage', '.nyc_output', 'htmlcov', 'test-results',
-            
-            # Temporary and cache directories
-            'tmp', 'temp', 'cache', '.cache', 'logs', 'log',
-            
-            # Package manager artifacts
-            'yarn.lock', 'package-lock.json', 'Pipfile.lock', 'poetry.lock',
+    def _file_priority(self, file_item: Dict[str, Any]) -> Tuple[int, int, str]:
+        """Sort key putting analyzable files first, then shallower paths."""
+        return (
+            0 if self._is_analyzable_file(self._get_file_extension(file_item["name"]).lower()) else 1,
+            file_item["path"].count("/"),  # Prefer files in shallower directories
+            file_item["name"]
+        )
+    
+    async def _discover_files_by_listing(self, owner: str, repo: str, max_files: int = 2000) -> List[Dict[str, Any]]:
+        """Recursively discover files by listing each directory's contents."""
+        all_files = []
+        frontier = [""]  # Start with root directory
+        processed_paths = {""}
+        file_limit = max_files * 3  # Explore more for filtering
+        
+        logger.info(f"Starting recursive file discovery for {owner}/{repo}")
+        
+        # Walk the tree level by level, listing up to github_max_concurrency
+        # sibling directories at once. Listings are consumed in queue order and
+        # the file limit is checked per directory, as in a sequential BFS.
+        batch_size = settings.github_max_concurrency
+        while frontier and len(all_files) < file_limit:
+            next_frontier = []
+            
+            for start in range(0, len(frontier), batch_size):
+                if len(all_files) >= file_limit:
+                    break
+                batch = frontier[start:start + batch_size]
+                listings = await asyncio.gather(
+                    *(
+                        self.github_client.get_repository_contents(owner, repo, path, recursive=False)
+                        for path in batch
+                    ),
+                    return_exceptions=True,
+                )
+                
+                for current_path, contents in zip(batch, listings):
+                    if len(all_files) >= file_limit:
+                        break
+                    if isinstance(contents, BaseException):
+                        logger.warning(f"Failed to fetch directory '{current_path}': {contents}")
+                        continue
+                    
+                    logger.debug(f"Exploring directory: '{current_path or 'root'}'")
+                    
+                    for item in contents:
+                        if item["type"] == "file":
+                            # Add file to our list
+                            all_files.append(item)
+                            
+                        elif item["type"] == "dir":
+                            # Skip certain directories to avoid infinite loops and irrelevant content
+                            if item["path"] in processed_paths:
+                                continue
+                            if not self._should_skip_directory(item["path"]):
+                                processed_paths.add(item["path"])
+                                next_frontier.append(item["path"])
+                            else:
+                                logger.debug(f"Skipping directory: {item['path']}")
             
-            # Hidden directories (except some important ones)
-            '.github', '.gitlab', '.circleci', '.travis', '.appveyor'
-        }
+            frontier = next_frontier
         
-        # Check if any part of the path matches skip patterns
-        path_parts = dir_path.lower().split('/')
+        return self._top_priority_files(all_files, max_files)
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _should_skip_directory(dir_path: str) -> bool:
+        """Check if we should skip exploring this directory.
         
-        for part in path_parts:
-            if part in skip_dirs:
+        Memoized because tree discovery asks once per file, so each directory
+        is checked as many times as it has files.
+        """
+        deep = dir_path.count('/') > 2
+        
+        # Check if any part of the path matches skip patterns
+        for part in dir_path.lower().split('/'):
+            if part in _SKIP_DIRS:
                 return True
             
             # Skip directories that look like build outputs or temp directories
@@ -440,7 +566,7 @@ class AnalyzerService:
                 return True
             
             # Skip test directories if they're very deep (likely to be test fixtures)
-            if 'test' in part and dir_path.count('/') > 2:
+            if deep and 'test' in part:
                 return True
         
-        return False
\ No newline at end of file
+        return False
@@ -1,16 +1,152 @@
 """GitHub API client for repository data fetching."""
 
 import asyncio
-import base64
-from typing import Dict, List, Optional, Any, Tuple
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any, Tuple
 
 import httpx
+import orjson
 from loguru import logger
 
 from ..config import settings
 from ..models.repository import Repository, FileInfo
 from .token_rotator import TokenRotator
+from .ttl_cache import TTLCache
+
+
+# Accept header asking GitHub for file and blob contents without base64/JSON
+_RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+# Git tree entry types and the contents API item types they correspond to
+_TREE_ITEM_TYPES = {"blob": "file", "tree": "dir", "commit": "submodule"}
+
+# Repository metadata and language breakdown in one GraphQL query (one
+# rate-limit point instead of a REST call each); fields mirror the REST
+# repository resource that get_repository parses
+_REPO_BUNDLE_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    databaseId name nameWithOwner description url
+    isPrivate isFork isArchived isDisabled
+    hasIssuesEnabled hasProjectsEnabled hasWikiEnabled
+    defaultBranchRef { name }
+    primaryLanguage { name }
+    diskUsage stargazerCount forkCount
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    createdAt updatedAt pushedAt
+    repositoryTopics(first: 100) { nodes { topic { name } } }
+    licenseInfo { name }
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+  }
+}
+"""
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub ISO 8601 timestamp, which may use a ``Z`` suffix.
+    
+    ``fromisoformat`` only accepts ``Z`` from Python 3.11 on.
+    """
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+# Longest rate-limit pause worth waiting out instead of failing the request
+_MAX_RATE_LIMIT_WAIT = 60
+
+# Per-token /rate_limit timeout when seeding budgets at startup
+_WARMUP_TIMEOUT = 10
+
+# Token of the caller the current request/task acts for (see token_scope)
+_current_token: ContextVar[Optional[str]] = ContextVar("gh_token", default=None)
+
+
+@contextmanager
+def token_scope(token: Optional[str]) -> Iterator[None]:
+    """Authenticate GitHub calls made in this context with ``token``.
+    
+    The token lives in a ContextVar, so concurrent requests sharing one
+    GitHubClient never see each other's credentials. A falsy token leaves
+    the client's own tokens in effect.
+    """
+    reset = _current_token.set(token or None)
+    try:
+        yield
+    finally:
+        _current_token.reset(reset)
+
+
+@lru_cache(maxsize=128)
+def _headers_for(token: Optional[str]) -> Dict[str, str]:
+    """Build GitHub API headers for ``token``, memoized per distinct token.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "0Unveiled-Analyzer/1.0",
+    }
+    
+    if token:
+        # Support both Bearer and token formats for compatibility
+        if token.startswith('ghp_') or token.startswith('github_pat_'):
+            headers["Authorization"] = f"Bearer {token}"
+        else:
+            headers["Authorization"] = f"token {token}"
+    
+    return headers
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retrying after failed ``attempt``: exponential, with jitter."""
+    return min(60, 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def _rate_limit_wait(response: httpx.Response, reset_ts: Optional[int]) -> float:
+    """Seconds GitHub asks a rate-limited client to wait.
+    
+    Secondary limits send Retry-After; the primary limit lifts at
+    X-RateLimit-Reset. Zero when neither header is present.
+    """
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    if reset_ts:
+        return max(0.0, reset_ts - time.time())
+    return 0.0
+
+
+class _Retryable(Exception):
+    """A failed request attempt that may succeed when retried.
+    
+    ``error`` is what the caller sees once attempts run out; ``wait`` is how
+    long GitHub asked to back off, when it said.
+    """
+    
+    def __init__(self, error: Exception, wait: Optional[float] = None):
+        super().__init__(str(error))
+        self.error = error
+        self.wait = wait
+
+
+class _RateLimited(_Retryable):
+    """GitHub rate limited the attempt; another token may go ahead at once."""
+    
+    def __init__(self, wait: float):
+        super().__init__(Exception("GitHub API rate limit exceeded on all tokens"), wait)
+
+
+def _last_page(links: Dict[str, Dict[str, str]]) -> int:
+    """Page number of the ``rel="last"`` link, or 1 when there is only one page."""
+    last = links.get("last")
+    if not last:
+        return 1
+    return int(httpx.URL(last["url"]).params.get("page", 1))
 
 
 class GitHubClient:
@@ -27,8 +163,29 @@ class GitHubClient:
         if settings.github_token:
             all_tokens.append(settings.github_token)
         
-        self.token_rotator = TokenRotator(all_tokens) if settings.github_token_rotation and all_tokens else None
-        self.headers = self._build_headers()
+        self.token_rotator = (
+            TokenRotator(all_tokens, state_file=settings.github_token_state_file)
+            if settings.github_token_rotation and all_tokens
+            else None
+        )
+        
+        # One pooled client for every request: connections (HTTP/2 where the
+        # server supports it) are kept alive instead of re-handshaking per call
+        self._http = httpx.AsyncClient(
+            base_url=self.api_url,
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30),
+        )
+        
+        # Requests in flight across all analyses sharing this client
+        self._request_slots = asyncio.Semaphore(settings.github_max_concurrency)
+        
+        # ETag-validated response bodies (see _make_request) and blob contents;
+        # blobs are addressed by content SHA, so a cached blob never goes stale
+        cache_limits = {"max_entries": settings.github_cache_size, "max_bytes": settings.github_cache_bytes}
+        self._conditional_cache = TTLCache(ttl=settings.cache_ttl, **cache_limits)
+        self._blob_cache = TTLCache(ttl=settings.cache_ttl, **cache_limits)
         
         # Rate limiting
         self.requests_made = 0
@@ -43,22 +200,37 @@ class GitHubClient:
     
     def _build_headers(self, token: Optional[str] = None) -> Dict[str, str]:
         """Build headers for GitHub API requests."""
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "0Unveiled-Analyzer/1.0",
-        }
-        
-        # Use provided token or get from rotator or fall back to default
-        auth_token = token or (self.token_rotator.get_next_available_token() if self.token_rotator else None) or self.token
-        
-        if auth_token:
-            # Support both Bearer and token formats for compatibility
-            if auth_token.startswith('ghp_') or auth_token.startswith('github_pat_'):
-                headers["Authorization"] = f"Bearer {auth_token}"
-            else:
-                headers["Authorization"] = f"token {auth_token}"
+        # Use provided token (_make_request resolves the rotator's) or fall back to default
+        auth_token = token or self.token
+        return _headers_for(auth_token or None)
+    
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Headers for the token in scope, or the client's default token."""
+        return _headers_for(_current_token.get() or self.token or None)
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections and save the token budgets."""
+        await self._http.aclose()
+        if self.token_rotator:
+            self.token_rotator.save_state()
+    
+    async def warm_up_tokens(self) -> None:
+        """Seed the token rotator with each token's actual remaining budget.
         
-        return headers
+        Safe to run as a background task: failures are logged, never raised.
+        """
+        if self.token_rotator:
+            await self.token_rotator.warmup(
+                lambda token: self._make_request(
+                    "GET",
+                    "rate_limit",
+                    headers=_headers_for(token),
+                    conditional=False,
+                    retry_count=1,
+                    timeout=_WARMUP_TIMEOUT,
+                )
+            )
     
     def is_configured(self) -> bool:
         """Check if GitHub client is properly configured."""
@@ -70,16 +242,98 @@ class GitHubClient:
         endpoint: str, 
         params: Optional[Dict] = None,
         timeout: int = 30,
-        retry_count: int = 3
-    ) -> Dict[str, Any]:
-        """Make an authenticated request to GitHub API with token rotation."""
-        url = f"{self.api_url}/{endpoint.lstrip('/')}"
+        retry_count: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+        raw: bool = False,
+        conditional: Optional[bool] = None,
+        with_links: bool = False,
+        json: Optional[Any] = None,
+    ) -> Any:
+        """Make an authenticated request to GitHub API with token rotation.
+        
+        Returns the decoded JSON body, or with ``raw`` the response bytes of a
+        request sent with the raw media type (file and blob contents).
+        
+        Conditional requests (every GET unless ``conditional`` says otherwise)
+        remember the response ETag and body bytes and revalidate with
+        If-None-Match next time; GitHub answers an unchanged resource with an
+        empty 304 that does not count against the rate limit. The cached bytes
+        are decoded again on every hit, so callers may mutate what they get.
+        
+        ``with_links`` returns ``(body, links)``, with the parsed Link header
+        used for pagination. ``json`` is sent as the request body.
+        
+        Explicit ``headers`` (see ``_headers_for``) or a token set with
+        ``token_scope`` authenticate the request as given and bypass the
+        token rotator.
+        
+        Network errors and 403s are retried up to ``retry_count`` attempts
+        with jittered exponential backoff; rate limits move on to another
+        token or wait as long as GitHub asks (see ``_send_once``).
+        """
+        # Relative to the client's base_url (GITHUB_API_URL)
+        url = endpoint.lstrip('/')
+        
+        if conditional is None:
+            conditional = method == "GET"
+        
+        # A scoped token is fixed for the whole request, so resolve it once
+        scoped_token = None
+        if headers is None:
+            scoped_token = _current_token.get()
+            if scoped_token:
+                headers = _headers_for(scoped_token)
         
         for attempt in range(retry_count):
-            # Get token for this request
-            current_token = None
+            try:
+                return await self._send_once(
+                    method, url, params, timeout, headers, scoped_token, raw, conditional, with_links, json
+                )
+            except _Retryable as e:
+                if attempt == retry_count - 1:
+                    raise e.error from None
+                
+                if isinstance(e, _RateLimited):
+                    # Another token can take over right away
+                    if self.token_rotator and headers is None and self.token_rotator.get_total_capacity()[1] > 0:
+                        logger.info(f"Retrying with different token (attempt {attempt + 1}/{retry_count})")
+                        continue
+                    # Otherwise wait out a short limit; a long one fails fast
+                    if e.wait >= _MAX_RATE_LIMIT_WAIT:
+                        raise Exception(f"GitHub API rate limit exceeded, lifts in {e.wait:.0f}s") from None
+                
+                delay = e.wait or _backoff_delay(attempt)
+                logger.info(f"Retrying request in {delay:.1f}s (attempt {attempt + 1}/{retry_count})")
+                await asyncio.sleep(delay)
+                
+                if isinstance(e, _RateLimited) and self.token_rotator:
+                    self.token_rotator.reset_blocked_tokens()
+    
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict],
+        timeout: int,
+        headers: Optional[Dict[str, str]],
+        token: Optional[str],
+        raw: bool,
+        conditional: bool,
+        with_links: bool,
+        json: Optional[Any],
+    ) -> Any:
+        """Make one attempt at a request for _make_request.
+        
+        Failures worth another attempt raise _Retryable (_RateLimited when
+        GitHub throttled the token); anything else raises as is.
+        """
+        # Get token for this request
+        current_token = token
+        if headers is not None:
+            request_headers = headers
+        else:
             if self.token_rotator:
-                current_token = self.token_rotator.get_next_available_token()
+                current_token = await self.token_rotator.get_next_available_token()
                 if not current_token:
                     logger.warning("No available tokens - all are rate limited")
                     raise Exception("All GitHub tokens are rate limited")
@@ -87,83 +341,157 @@ class GitHubClient:
                 current_token = self.token
             
             # Build headers with current token
-            headers = self._build_headers(current_token)
+            request_headers = self._build_headers(current_token)
+        
+        if raw:
+            # Header dicts are shared; copy before overriding Accept
+            request_headers = {**request_headers, "Accept": _RAW_MEDIA_TYPE}
+        
+        cached = None
+        if conditional:
+            # Responses may differ per credential, so the token is part of the key
+            cache_key = (url, tuple(sorted((params or {}).items())), request_headers.get("Authorization"), raw)
+            cached = self._conditional_cache.get(cache_key)
+            if cached is not None:
+                request_headers = {**request_headers, "If-None-Match": cached[0]}
+        
+        try:
+            async with self._request_slots:
+                response = await self._http.request(
+                    method=method,
+                    url=url,
+                    headers=request_headers,
+                    params=params or {},
+                    json=json,
+                    timeout=timeout,
+                )
+            
+            # Extract rate limit info from headers; a 304 leaves the budget unchanged
+            default_remaining = self.rate_limit_remaining if response.status_code == 304 else 0
+            remaining = int(response.headers.get("X-RateLimit-Remaining", default_remaining))
+            reset_timestamp = response.headers.get("X-RateLimit-Reset")
+            reset_ts = int(reset_timestamp) if reset_timestamp else None
+            # GraphQL and search have budgets of their own; only the REST
+            # ("core") budget is tracked
+            core_budget = response.headers.get("X-RateLimit-Resource", "core") == "core"
+            
+            # Update global rate limit tracking
+            if core_budget:
+                self.rate_limit_remaining = remaining
+                if reset_ts:
+                    self.rate_limit_reset = datetime.fromtimestamp(reset_ts)
+            
+            self.requests_made += 1
+            
+            rate_limited = response.status_code in (403, 429) and "rate limit" in response.text.lower()
+            wait = _rate_limit_wait(response, reset_ts) if rate_limited else 0.0
+            # A limit on another budget does not stop the token's REST calls
+            rests_token = rate_limited and core_budget
+            
+            # Update token rotator once the outcome is known: only answered
+            # requests raise its pace, and a rate limit rests the token
+            if self.token_rotator and current_token:
+                self.token_rotator.update_token_usage(
+                    current_token, 
+                    remaining_requests=remaining if core_budget else None,
+                    reset_timestamp=reset_ts if core_budget else None,
+                    success=response.is_success or response.status_code == 304,
+                    throttled=rests_token,
+                    blocked_until=time.time() + wait if rests_token else None,
+                )
+            
+            # Handle rate limiting
+            if rate_limited:
+                logger.warning(f"Rate limit hit for token ending in ...{current_token[-4:] if current_token else 'None'}")
+                raise _RateLimited(wait)
+            
+            if cached is not None and response.status_code == 304:
+                content = cached[1]
+            else:
+                response.raise_for_status()
+                content = response.content
+                etag = response.headers.get("ETag") if conditional else None
+                if etag:
+                    self._conditional_cache.set(cache_key, (etag, content), size=len(content))
+            
+            body = content if raw else orjson.loads(content)
+            return (body, response.links) if with_links else body
+        
+        except _Retryable:
+            raise
+        
+        except Exception as e:
+            status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            if status_code is not None:
+                logger.error(f"GitHub API error {status_code}: {e.response.text}")
+            else:
+                logger.error(f"GitHub API request failed: {e}")
+            
+            # Error responses were already reported along with their headers
+            if self.token_rotator and current_token and status_code is None:
+                self.token_rotator.update_token_usage(current_token, success=False)
+            
+            if status_code is None:
+                raise _Retryable(e)
+            error = Exception(f"GitHub API error: {status_code}")
+            # Don't retry on non-rate-limit errors
+            if status_code != 403:
+                raise error
+            raise _Retryable(error)
+
+    async def _iter_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        max_pages: int,
+        label: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the items of up to ``max_pages`` pages of a list endpoint.
+        
+        The first page's Link header tells how many pages exist, so the rest
+        are requested concurrently and yielded in page order as they arrive;
+        a failed page ends the stream there, as a sequential walk would.
+        """
+        if max_pages < 1:
+            return
+        
+        try:
+            items, links = await self._make_request(
+                "GET", endpoint, {**params, "page": 1}, with_links=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fetch {label} page 1: {e}")
+            return
+        
+        if not items:
+            return
+        
+        pages = range(2, min(_last_page(links), max_pages) + 1)
+        tasks = [
+            asyncio.ensure_future(self._make_request("GET", endpoint, {**params, "page": page}))
+            for page in pages
+        ]
+        try:
+            for item in items:
+                yield item
             
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            for page, task in zip(pages, tasks):
                 try:
-                    response = await client.request(
-                        method=method,
-                        url=url,
-                        headers=headers,
-                        params=params or {},
-                    )
-                    
-                    # Extract rate limit info from headers
-                    remaining = int(response.headers.get("X-RateLimit-Remaining", 0))
-                    reset_timestamp = response.headers.get("X-RateLimit-Reset")
-                    reset_ts = int(reset_timestamp) if reset_timestamp else None
-                    
-                    # Update global rate limit tracking
-                    self.rate_limit_remaining = remaining
-                    if reset_ts:
-                        self.rate_limit_reset = datetime.fromtimestamp(reset_ts)
-                    
-                    # Update token rotator with usage info
-                    if self.token_rotator and current_token:
-                        self.token_rotator.update_token_usage(
-                            current_token, 
-                            remaining_requests=remaining,
-                            reset_timestamp=reset_ts,
-                            success=True
-                        )
-                    
-                    self.requests_made += 1
-                    
-                    # Handle rate limiting
-                    if response.status_code == 403 and "rate limit" in response.text.lower():
-                        logger.warning(f"Rate limit hit for token ending in ...{current_token[-4:] if current_token else 'None'}")
-                        
-                        if self.token_rotator and current_token:
-                            self.token_rotator.update_token_usage(current_token, remaining_requests=0, success=False)
-                        
-                        if attempt < retry_count - 1:
-                            logger.info(f"Retrying with different token (attempt {attempt + 1}/{retry_count})")
-                            continue
-                        else:
-                            raise Exception("GitHub API rate limit exceeded on all tokens")
-                    
-                    response.raise_for_status()
-                    return response.json()
-                    
-                except httpx.HTTPStatusError as e:
-                    logger.error(f"GitHub API error {e.response.status_code}: {e.response.text}")
-                    
-                    # Update token rotator on failure
-                    if self.token_rotator and current_token:
-                        self.token_rotator.update_token_usage(current_token, success=False)
-                    
-                    # Don't retry on non-rate-limit errors
-                    if e.response.status_code != 403:
-                        raise Exception(f"GitHub API error: {e.response.status_code}")
-                    
-                    if attempt < retry_count - 1:
-                        logger.info(f"Retrying request (attempt {attempt + 1}/{retry_count})")
-                        continue
-                    else:
-                        raise Exception(f"GitHub API error: {e.response.status_code}")
-                        
+                    result = await task
                 except Exception as e:
-                    logger.error(f"GitHub API request failed: {e}")
-                    
-                    # Update token rotator on failure
-                    if self.token_rotator and current_token:
-                        self.token_rotator.update_token_usage(current_token, success=False)
-                    
-                    if attempt < retry_count - 1:
-                        logger.info(f"Retrying request (attempt {attempt + 1}/{retry_count})")
-                        continue
-                    else:
-                        raise
+                    logger.warning(f"Failed to fetch {label} page {page}: {e}")
+                    break
+                if not result:
+                    break
+                for item in result:
+                    yield item
+        finally:
+            # Pages past an early stop or a failed page are not needed
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Mark a failure nobody awaited as retrieved
     
     async def get_repository(self, owner: str, repo: str) -> Repository:
         """Get repository information."""
@@ -187,9 +515,9 @@ class GitHubClient:
             watchers_count=data["watchers_count"],
             forks_count=data["forks_count"],
             open_issues_count=data["open_issues_count"],
-            created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")),
-            pushed_at=datetime.fromisoformat(data["pushed_at"].replace("Z", "+00:00")) if data.get("pushed_at") else None,
+            created_at=_parse_timestamp(data["created_at"]),
+            updated_at=_parse_timestamp(data["updated_at"]),
+            pushed_at=_parse_timestamp(data.get("pushed_at")),
             topics=data.get("topics", []),
             license=data.get("license", {}).get("name") if data.get("license") else None,
             has_issues=data.get("has_issues", True),
@@ -200,6 +528,74 @@ class GitHubClient:
             disabled=data.get("disabled", False),
         )
     
+    async def fetch_repo_bundle(self, owner: str, repo: str) -> Tuple[Repository, Dict[str, int]]:
+        """Get repository information and language breakdown together.
+        
+        Uses a single GraphQL request when a token is available (GitHub's
+        GraphQL API rejects anonymous calls) and falls back to the REST
+        endpoints when there is none or the query fails.
+        """
+        if _current_token.get() or self.token or self.token_rotator:
+            try:
+                return await self._fetch_repo_bundle_graphql(owner, repo)
+            except Exception as e:
+                logger.warning(f"GraphQL fetch failed for {owner}/{repo}, using REST: {e}")
+        
+        repository, languages = await asyncio.gather(
+            self.get_repository(owner, repo),
+            self.get_repository_languages(owner, repo),
+        )
+        return repository, languages
+    
+    async def _fetch_repo_bundle_graphql(self, owner: str, repo: str) -> Tuple[Repository, Dict[str, int]]:
+        """Run the repository bundle query and map it onto the REST shapes."""
+        logger.info(f"Fetching repository bundle for {owner}/{repo} via GraphQL")
+        
+        response = await self._make_request(
+            "POST",
+            "graphql",
+            json={"query": _REPO_BUNDLE_QUERY, "variables": {"owner": owner, "name": repo}},
+        )
+        # GraphQL reports failures in the body of a 200 response
+        data = (response.get("data") or {}).get("repository")
+        if response.get("errors") or not data:
+            messages = [error.get("message") for error in response.get("errors", [])]
+            raise Exception(f"GraphQL error: {messages or 'repository not found'}")
+        
+        stars = data["stargazerCount"]
+        repository = Repository(
+            id=data["databaseId"],
+            name=data["name"],
+            full_name=data["nameWithOwner"],
+            description=data.get("description"),
+            private=data["isPrivate"],
+            fork=data["isFork"],
+            html_url=data["url"],
+            clone_url=f"{data['url']}.git",
+            default_branch=(data.get("defaultBranchRef") or {}).get("name", "main"),
+            language=(data.get("primaryLanguage") or {}).get("name"),
+            size=data["diskUsage"] or 0,
+            stargazers_count=stars,
+            # REST's watchers_count is the star count as well
+            watchers_count=stars,
+            forks_count=data["forkCount"],
+            # REST counts open pull requests as issues
+            open_issues_count=data["issues"]["totalCount"] + data["pullRequests"]["totalCount"],
+            created_at=_parse_timestamp(data["createdAt"]),
+            updated_at=_parse_timestamp(data["updatedAt"]),
+            pushed_at=_parse_timestamp(data.get("pushedAt")),
+            topics=[node["topic"]["name"] for node in data["repositoryTopics"]["nodes"]],
+            license=(data.get("licenseInfo") or {}).get("name"),
+            has_issues=data["hasIssuesEnabled"],
+            has_projects=data["hasProjectsEnabled"],
+            has_wiki=data["hasWikiEnabled"],
+            archived=data["isArchived"],
+            disabled=data["isDisabled"],
+        )
+        # Largest first, like the REST languages endpoint
+        languages = {edge["node"]["name"]: edge["size"] for edge in data["languages"]["edges"]}
+        return repository, languages
+    
     async def get_repository_languages(self, owner: str, repo: str) -> Dict[str, int]:
         """Get repository language breakdown."""
         logger.info(f"Fetching languages for {owner}/{repo}")
@@ -218,6 +614,12 @@ class GitHubClient:
         """Get repository contents."""
         logger.info(f"Fetching contents for {owner}/{repo} at path '{path}'")
         
+        if recursive:
+            # One tree request instead of one listing per directory
+            contents = await self._contents_from_tree(owner, repo, path, max_files)
+            if contents is not None:
+                return contents
+        
         all_contents = []
         
         try:
@@ -226,20 +628,29 @@ class GitHubClient:
             if not isinstance(data, list):
                 data = [data]
             
+            # Walk subdirectories concurrently (bounded by the client's request
+            # slots). Each gets the full budget; merging in listing order and
+            # truncating yields the same files as a sequential depth-first walk.
+            subdirs = [item for item in data if item["type"] == "dir"] if recursive else []
+            sub_results = await asyncio.gather(
+                *(
+                    self.get_repository_contents(owner, repo, item["path"], recursive=True, max_files=max_files)
+                    for item in subdirs
+                ),
+                return_exceptions=True,
+            )
+            sub_contents = {item["path"]: result for item, result in zip(subdirs, sub_results)}
+            
             for item in data:
                 all_contents.append(item)
                 
                 # If it's a directory and we want recursive listing
-                if recursive and item["type"] == "dir" and len(all_contents) < max_files:
-                    try:
-                        sub_contents = await self.get_repository_contents(
-                            owner, repo, item["path"], recursive=True, 
-                            max_files=max_files - len(all_contents)
-                        )
-                        all_contents.extend(sub_contents)
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch contents for {item['path']}: {e}")
+                if item["path"] in sub_contents and len(all_contents) < max_files:
+                    result = sub_contents[item["path"]]
+                    if isinstance(result, BaseException):
+                        logger.warning(f"Failed to fetch contents for {item['path']}: {result}")
                         continue
+                    all_contents.extend(result[:max_files - len(all_contents)])
                 
                 if len(all_contents) >= max_files:
                     logger.warning(f"Reached max files limit ({max_files}) for {owner}/{repo}")
@@ -251,22 +662,90 @@ class GitHubClient:
         
         return all_contents
     
-    async def get_file_content(self, owner: str, repo: str, path: str) -> Optional[str]:
-        """Get content of a specific file."""
+    async def _contents_from_tree(
+        self, owner: str, repo: str, path: str, max_files: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Everything below ``path`` as contents API items, taken from the recursive tree.
+        
+        Returns None when the tree is unavailable, truncated or has nothing
+        below ``path`` (e.g. ``path`` is a file), so the caller lists directly.
+        """
         try:
-            data = await self._make_request("GET", f"repos/{owner}/{repo}/contents/{path}")
-            
-            if data.get("encoding") == "base64":
-                content = base64.b64decode(data["content"]).decode("utf-8")
-                return content
-            else:
-                logger.warning(f"Unsupported encoding for {path}: {data.get('encoding')}")
-                return None
+            tree = await self.get_repository_tree(owner, repo)
+        except Exception as e:
+            logger.warning(f"Could not fetch tree for {owner}/{repo}, listing directories instead: {e}")
+            return None
+        
+        if tree.get("truncated"):
+            logger.warning(f"Tree for {owner}/{repo} is truncated, listing directories instead")
+            return None
+        
+        path = path.strip("/")
+        prefix = f"{path}/" if path else ""
+        contents = []
+        for entry in tree.get("tree", []):
+            entry_path = entry["path"]
+            item_type = _TREE_ITEM_TYPES.get(entry["type"])
+            if item_type is None or not entry_path.startswith(prefix):
+                continue
+            contents.append({
+                "name": entry_path.rpartition("/")[2],
+                "path": entry_path,
+                "sha": entry["sha"],
+                "size": entry.get("size", 0),
+                "type": item_type,
+            })
+            if len(contents) >= max_files:
+                logger.warning(f"Reached max files limit ({max_files}) for {owner}/{repo}")
+                break
+        
+        return contents or None
+    
+    async def get_file_content(self, owner: str, repo: str, path: str) -> Optional[bytes]:
+        """Get the raw bytes of a specific file; decoding is left to the caller."""
+        try:
+            # Raw media type: the file bytes as-is, no base64/JSON wrapping
+            return await self._make_request("GET", f"repos/{owner}/{repo}/contents/{path}", raw=True)
                 
         except Exception as e:
             logger.warning(f"Failed to fetch file content for {path}: {e}")
             return None
     
+    async def get_repository_tree(
+        self, owner: str, repo: str, ref: str = "HEAD", recursive: bool = True
+    ) -> Dict[str, Any]:
+        """Get the repository tree at ``ref``; recursively, in a single request.
+        
+        ``ref`` may be a branch, tag or SHA; ``HEAD`` is the default branch.
+        Returns GitHub's response: ``tree`` holds one entry per blob and tree
+        with ``path``, ``type``, ``sha`` and (for blobs) ``size``; ``truncated``
+        is set when the tree exceeded GitHub's size limits.
+        """
+        logger.info(f"Fetching tree for {owner}/{repo} at '{ref}'")
+        
+        return await self._make_request(
+            "GET",
+            f"repos/{owner}/{repo}/git/trees/{ref}",
+            params={"recursive": 1} if recursive else None,
+        )
+    
+    async def get_blob_content(self, owner: str, repo: str, sha: str) -> Optional[bytes]:
+        """Get the raw bytes of a blob by its SHA; decoding is left to the caller."""
+        try:
+            cached = self._blob_cache.get(sha)
+            if cached is not None:
+                return cached
+            # Blobs never change, so the SHA cache needs no ETag revalidation
+            content = await self._make_request(
+                "GET", f"repos/{owner}/{repo}/git/blobs/{sha}", raw=True, conditional=False
+            )
+            self._blob_cache.set(sha, content, size=len(content))
+            return content
+                
+        except Exception as e:
+            logger.warning(f"Failed to fetch blob {sha}: {e}")
+            return None
+    
     async def get_repository_commits(
         self, 
         owner: str, 
@@ -279,37 +758,43 @@ class GitHubClient:
         """Get repository commits."""
         logger.info(f"Fetching commits for {owner}/{repo}")
         
+        all_commits = [
+            commit
+            async for commit in self.iter_repository_commits(owner, repo, since, until, per_page, max_pages)
+        ]
+        
+        logger.info(f"Fetched {len(all_commits)} commits for {owner}/{repo}")
+        return all_commits
+    
+    def iter_repository_commits(
+        self, 
+        owner: str, 
+        repo: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        per_page: int = 100,
+        max_pages: int = 10
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream repository commits page by page, newest first."""
         params = {"per_page": per_page}
         if since:
             params["since"] = since.isoformat()
         if until:
             params["until"] = until.isoformat()
         
-        all_commits = []
-        page = 1
-        
-        while page <= max_pages:
-            params["page"] = page
-            
-            try:
-                commits = await self._make_request("GET", f"repos/{owner}/{repo}/commits", params)
-                
-                if not commits:
-                    break
-                
-                all_commits.extend(commits)
-                
-                if len(commits) < per_page:
-                    break
-                
-                page += 1
-                
-            except Exception as e:
-                logger.warning(f"Failed to fetch commits page {page}: {e}")
-                break
+        return self._iter_pages(f"repos/{owner}/{repo}/commits", params, max_pages, "commits")
+    
+    async def get_head_commit(
+        self, owner: str, repo: str, access_token: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the latest commit on the default branch, or None if there is none.
         
-        logger.info(f"Fetched {len(all_commits)} commits for {owner}/{repo}")
-        return all_commits
+        ``access_token`` authenticates the call as with ``token_scope``; without
+        one the client's own tokens are used.
+        """
+        with token_scope(access_token):
+            commits = await self.get_repository_commits(owner, repo, per_page=1, max_pages=1)
+        return commits[0] if commits else None
     
     async def get_repository_contributors(
         self, 
@@ -342,37 +827,26 @@ class GitHubClient:
         """Get repository issues and pull requests."""
         logger.info(f"Fetching issues for {owner}/{repo}")
         
-        all_issues = []
-        page = 1
-        
-        while page <= max_pages:
-            try:
-                issues = await self._make_request(
-                    "GET", 
-                    f"repos/{owner}/{repo}/issues",
-                    params={"state": state, "per_page": per_page, "page": page}
-                )
-                
-                if not issues:
-                    break
-                
-                all_issues.extend(issues)
-                
-                if len(issues) < per_page:
-                    break
-                
-                page += 1
-                
-            except Exception as e:
-                logger.warning(f"Failed to fetch issues page {page}: {e}")
-                break
-        
-        return all_issues
+        return [issue async for issue in self.iter_repository_issues(owner, repo, state, per_page, max_pages)]
+    
+    def iter_repository_issues(
+        self, 
+        owner: str, 
+        repo: str,
+        state: str = "all",
+        per_page: int = 100,
+        max_pages: int = 5
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream repository issues and pull requests page by page."""
+        return self._iter_pages(
+            f"repos/{owner}/{repo}/issues", {"state": state, "per_page": per_page}, max_pages, "issues"
+        )
     
     async def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status."""
         try:
-            data = await self._make_request("GET", "rate_limit")
+            # Free to call and always fresh, so never served from the ETag cache
+            data = await self._make_request("GET", "rate_limit", conditional=False)
             
             # Add token rotation info if available
             if self.token_rotator:
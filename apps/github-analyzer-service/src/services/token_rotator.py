@@ -1,81 +1,147 @@
 """GitHub token rotation manager for handling rate limits."""
 
+import asyncio
+import hashlib
+import json
+import os
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from loguru import logger
 
 
+# Adaptive token bucket: each token's request rate (per second) grows while
+# requests succeed and halves when GitHub throttles it, within these bounds.
+# GitHub's secondary rate limit allows about 900 REST requests per minute.
+_INITIAL_RATE = 10.0
+_MIN_RATE = 1.0
+_MAX_RATE = 15.0
+_RATE_STEP = 1.0  # Additive increase...
+_RATE_GROWTH = 1.1  # ...or multiplicative, whichever is smaller
+_RATE_BACKOFF = 0.5
+
+
+def _token_key(token: str) -> str:
+    """Key a token by its SHA-256 so saved state never contains the token itself."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 @dataclass
 class TokenState:
     """State tracking for a GitHub token."""
     token: str
     remaining_requests: int = 5000
-    reset_time: datetime = None
-    last_used: datetime = None
+    reset_time: Optional[float] = None  # Epoch seconds, as GitHub reports it
+    last_used: Optional[float] = None  # time.monotonic() seconds
     is_blocked: bool = False
     consecutive_failures: int = 0
+    rate: float = _INITIAL_RATE  # Requests per second this token may issue
+    bucket: float = _INITIAL_RATE  # Requests it may issue right now; holds up to one second's worth
+    bucket_updated: Optional[float] = None  # time.monotonic() seconds of the last refill
+    blocked_until: Optional[float] = None  # Epoch seconds a throttled token rests until
 
 
 class TokenRotator:
     """Manages GitHub token rotation to handle rate limits."""
     
-    def __init__(self, tokens: List[str]):
-        """Initialize with list of GitHub tokens."""
+    def __init__(self, tokens: List[str], state_file: Optional[str] = None):
+        """Initialize with list of GitHub tokens.
+        
+        ``state_file`` keeps each token's remaining budget across restarts
+        (see ``save_state``); budgets whose window has not reset yet are
+        restored from it.
+        """
         self.tokens = {
-            token: TokenState(token=token, reset_time=datetime.now())
+            token: TokenState(token=token, reset_time=time.time())
             for token in tokens if token.strip()
         }
         self.current_token_index = 0
         self.last_rotation = datetime.now()
+        self.state_file = os.path.expanduser(state_file) if state_file else None
+        
+        if self.state_file:
+            self._load_state()
         
         if not self.tokens:
             logger.warning("No GitHub tokens provided - rate limiting will be severe")
         else:
             logger.info(f"Token rotator initialized with {len(self.tokens)} tokens")
     
-    def get_next_available_token(self) -> Optional[str]:
-        """Get the next available token for API requests."""
+    async def get_next_available_token(self) -> Optional[str]:
+        """Get the next available token for API requests.
+        
+        Waits until the token's bucket allows another request, so requests
+        are paced below GitHub's limits instead of running into 403s.
+        """
+        token = self._select_token()
+        if token is None:
+            return None
+        
+        delay = self._take_from_bucket(self.tokens[token])
+        if delay > 0:
+            logger.debug(f"Throttling token ending in ...{token[-4:]} for {delay:.2f}s")
+            await asyncio.sleep(delay)
+        return token
+    
+    @staticmethod
+    def _take_from_bucket(state: TokenState) -> float:
+        """Spend one request from the token's bucket; returns seconds to wait first.
+        
+        The bucket may go negative: concurrent callers then queue up behind
+        each other, each waiting for its own share of the refill.
+        """
+        now = time.monotonic()
+        if state.bucket_updated is not None:
+            state.bucket = min(state.rate, state.bucket + (now - state.bucket_updated) * state.rate)
+        state.bucket_updated = now
+        state.bucket -= 1
+        return -state.bucket / state.rate if state.bucket < 0 else 0.0
+    
+    def _select_token(self) -> Optional[str]:
+        """Pick the available token with the most headroom."""
         if not self.tokens:
             return None
         
-        # Sort tokens by availability (remaining requests, reset time)
-        available_tokens = []
+        # Pick the highest-priority token in one pass; the first of equals
+        # wins, as with a stable sort
+        now = time.time()
+        monotonic_now = time.monotonic()
+        best_token_id = None
+        best_state = None
+        best_priority = None
         
         for token_id, state in self.tokens.items():
-            if not state.is_blocked:
-                # Calculate priority score (higher is better)
-                now = datetime.now()
-                
-                # Reset rate limit if enough time has passed
-                if state.reset_time and now >= state.reset_time:
-                    state.remaining_requests = 5000
-                    state.is_blocked = False
-                    state.consecutive_failures = 0
-                    logger.info(f"Rate limit reset for token ending in ...{token_id[-4:]}")
-                
-                # Priority based on remaining requests and last usage
-                priority = state.remaining_requests
-                
-                # Bonus for tokens that haven't been used recently
-                if state.last_used:
-                    minutes_since_use = (now - state.last_used).total_seconds() / 60
-                    priority += min(100, minutes_since_use)  # Up to 100 bonus points
-                
-                available_tokens.append((token_id, priority, state))
-        
-        if not available_tokens:
+            if state.is_blocked:
+                continue
+            
+            # Reset rate limit if enough time has passed
+            if state.reset_time and now >= state.reset_time:
+                state.remaining_requests = 5000
+                state.is_blocked = False
+                state.consecutive_failures = 0
+                logger.info(f"Rate limit reset for token ending in ...{token_id[-4:]}")
+            
+            # Priority based on remaining requests and last usage (higher is better)
+            priority = state.remaining_requests
+            
+            # Bonus for tokens that haven't been used recently
+            if state.last_used is not None:
+                minutes_since_use = (monotonic_now - state.last_used) / 60
+                priority += min(100, minutes_since_use)  # Up to 100 bonus points
+            
+            if best_priority is None or priority > best_priority:
+                best_token_id, best_state, best_priority = token_id, state, priority
+        
+        if best_state is None:
+            # Blocks may have lifted since; nothing else would release them
+            if self.reset_blocked_tokens():
+                return self._select_token()
             logger.warning("No available tokens - all are rate limited")
             return None
         
-        # Sort by priority (highest first)
-        available_tokens.sort(key=lambda x: x[1], reverse=True)
-        
-        # Select the best token
-        best_token_id, _, best_state = available_tokens[0]
-        best_state.last_used = datetime.now()
+        best_state.last_used = monotonic_now
         
         logger.debug(f"Selected token ending in ...{best_token_id[-4:]} "
                     f"({best_state.remaining_requests} requests remaining)")
@@ -86,15 +152,29 @@ class TokenRotator:
         self, 
         token: str, 
         remaining_requests: Optional[int] = None,
-        reset_timestamp: Optional[int] = None,
-        success: bool = True
+        reset_timestamp: Optional[float] = None,
+        success: bool = True,
+        throttled: bool = False,
+        blocked_until: Optional[float] = None,
     ) -> None:
-        """Update token state after API request."""
+        """Update token state after API request.
+        
+        ``throttled`` reports that GitHub rate limited the request, which
+        halves the token's request rate; successes raise it again.
+        ``blocked_until`` (epoch seconds) rests the token until GitHub lets
+        it make requests again.
+        """
         if token not in self.tokens:
             return
         
         state = self.tokens[token]
-        state.last_used = datetime.now()
+        state.last_used = time.monotonic()
+        
+        if throttled:
+            state.rate = max(_MIN_RATE, state.rate * _RATE_BACKOFF)
+            logger.info(f"Token ending in ...{token[-4:]} throttled, slowing to {state.rate:.1f} requests/s")
+        elif success:
+            state.rate = min(_MAX_RATE, state.rate + _RATE_STEP, state.rate * _RATE_GROWTH)
         
         if success:
             state.consecutive_failures = 0
@@ -106,8 +186,21 @@ class TokenRotator:
                 state.is_blocked = True
                 logger.warning(f"Token ending in ...{token[-4:]} blocked due to repeated failures")
         
+        if blocked_until is not None:
+            state.is_blocked = True
+            state.blocked_until = blocked_until
+        
+        # Concurrent responses can arrive out of order. One from an earlier
+        # rate limit window says nothing about the current one, so it is
+        # ignored; within a window the lowest count is the latest, and a later
+        # reset time means a new window has started.
+        if reset_timestamp is not None and state.reset_time is not None and reset_timestamp < state.reset_time:
+            return
+        
         # Update rate limit info from response headers
         if remaining_requests is not None:
+            if reset_timestamp is None or reset_timestamp == state.reset_time:
+                remaining_requests = min(remaining_requests, state.remaining_requests)
             state.remaining_requests = remaining_requests
             
             # Block token if rate limited
@@ -117,19 +210,102 @@ class TokenRotator:
                            f"({remaining_requests} requests remaining)")
         
         if reset_timestamp is not None:
-            state.reset_time = datetime.fromtimestamp(reset_timestamp)
-            logger.debug(f"Rate limit resets at {state.reset_time} for token ...{token[-4:]}")
+            state.reset_time = float(reset_timestamp)
+            logger.debug(f"Rate limit resets at {reset_timestamp} (epoch) for token ...{token[-4:]}")
+    
+    async def warmup(self, fetch_rate_limit: Callable[[str], Awaitable[Dict[str, Any]]]) -> None:
+        """Seed every token's budget from GitHub, checking all tokens in parallel.
+        
+        ``fetch_rate_limit`` returns the ``/rate_limit`` response for a token;
+        that endpoint does not count against the limit.
+        """
+        tokens = list(self.tokens)
+        results = await asyncio.gather(*(fetch_rate_limit(token) for token in tokens), return_exceptions=True)
+        
+        seeded = 0
+        for token, result in zip(tokens, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Could not fetch rate limit for token ending in ...{token[-4:]}: {result}")
+                continue
+            rate = result.get("rate") or {}
+            if "remaining" not in rate:
+                continue
+            # GitHub's own count replaces the assumed or restored one
+            state = self.tokens[token]
+            state.remaining_requests = int(rate["remaining"])
+            if rate.get("reset"):
+                state.reset_time = float(rate["reset"])
+            seeded += 1
+        
+        remaining, _ = self.get_total_capacity()
+        logger.info(f"Seeded rate limits for {seeded}/{len(tokens)} tokens ({remaining} total requests)")
+    
+    def _load_state(self) -> None:
+        """Restore budgets saved by a previous process for windows still open."""
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read token state from {self.state_file}: {e}")
+            return
+        
+        if not isinstance(saved, dict):
+            return
+        
+        now = time.time()
+        restored = 0
+        for token, state in self.tokens.items():
+            entry = saved.get(_token_key(token))
+            if not isinstance(entry, dict) or entry.get("reset", 0) <= now:
+                continue
+            # A low budget ranks the token last until its window resets
+            state.remaining_requests = int(entry["remaining"])
+            state.reset_time = float(entry["reset"])
+            restored += 1
+        
+        if restored:
+            logger.info(f"Restored rate limit state for {restored} tokens")
+    
+    def save_state(self) -> None:
+        """Write each token's remaining budget and reset time to the state file.
+        
+        The file is replaced atomically, so a crash mid-write leaves the
+        previous state intact.
+        """
+        if not self.state_file:
+            return
+        
+        saved = {
+            _token_key(token): {"remaining": state.remaining_requests, "reset": state.reset_time}
+            for token, state in self.tokens.items()
+            if state.reset_time
+        }
+        temp_file = f"{self.state_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            os.replace(temp_file, self.state_file)
+        except OSError as e:
+            logger.warning(f"Could not save token state to {self.state_file}: {e}")
     
     def get_token_status(self) -> Dict[str, Dict]:
         """Get status of all tokens for monitoring."""
         status = {}
+        # Monotonic last-use times are reported as wall-clock times
+        wall_offset = time.time() - time.monotonic()
         
         for token_id, state in self.tokens.items():
             masked_token = f"...{token_id[-4:]}"
             status[masked_token] = {
                 "remaining_requests": state.remaining_requests,
-                "reset_time": state.reset_time.isoformat() if state.reset_time else None,
-                "last_used": state.last_used.isoformat() if state.last_used else None,
+                "reset_time": datetime.fromtimestamp(state.reset_time).isoformat() if state.reset_time else None,
+                "last_used": (
+                    datetime.fromtimestamp(state.last_used + wall_offset).isoformat()
+                    if state.last_used is not None else None
+                ),
                 "is_blocked": state.is_blocked,
                 "consecutive_failures": state.consecutive_failures
             }
@@ -154,13 +330,17 @@ class TokenRotator:
     def reset_blocked_tokens(self) -> int:
         """Reset tokens that should no longer be blocked."""
         reset_count = 0
-        now = datetime.now()
+        now = time.time()
         
         for state in self.tokens.values():
-            if state.is_blocked and state.reset_time and now >= state.reset_time:
+            # A throttled token rests until GitHub's pause ends, others until the window resets
+            until = state.blocked_until if state.blocked_until is not None else state.reset_time
+            if state.is_blocked and until and now >= until:
                 state.is_blocked = False
-                state.remaining_requests = 5000
+                state.blocked_until = None
                 state.consecutive_failures = 0
+                if state.reset_time and now >= state.reset_time:
+                    state.remaining_requests = 5000
                 reset_count += 1
                 logger.info(f"Unblocked token ending in ...{state.token[-4:]}")
         
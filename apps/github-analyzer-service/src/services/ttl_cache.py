@@ -0,0 +1,71 @@
+"""In-process TTL cache with per-key locks for coalescing concurrent work."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    ``lock(key)`` hands out one ``asyncio.Lock`` per key so concurrent callers
+    computing the same value can wait for the first one instead of repeating
+    the work (thundering-herd prevention).
+
+    With ``max_bytes``, entries also count the ``size`` given to ``set``
+    against that budget; a value larger than the whole budget is not stored.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 128, max_bytes: Optional[int] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._bytes = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` or None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, size = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """Store ``value`` under ``key``, evicting least recently used entries.
+
+        ``size`` is the value's weight in bytes against ``max_bytes``.
+        """
+        self._locks.pop(key, None)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            self._bytes -= self._entries.popitem(last=False)[1][2]
+
+    def lock(self, key: Hashable) -> asyncio.Lock:
+        """Get the lock serializing computation of ``key``."""
+        if len(self._locks) > self.max_entries:
+            # Drop idle locks left behind by computations that never cached
+            for stale in [k for k, lk in self._locks.items() if not lk.locked()]:
+                del self._locks[stale]
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+        self._locks.clear()
+        self._bytes = 0
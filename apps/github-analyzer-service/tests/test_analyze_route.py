@@ -0,0 +1,115 @@
+"""Tests for caching and conditional responses of the analyze-repository route."""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.deps import get_analyzer_service, get_github_client
+from src.models.analysis import AIInsights, RepositoryAnalysis, TechStack
+from src.models.metrics import CodeMetrics, QualityMetrics, SecurityMetrics
+from src.models.repository import Repository
+from src.routes import auth
+
+
+BODY = {"access_token": "", "owner": "octo", "repo": "repo", "max_files": 10}
+
+
+class StubGitHubClient:
+    async def get_head_commit(self, owner, repo, access_token=None):
+        return {"sha": "abc123", "commit": {"author": {"date": "2024-01-01T00:00:00Z"}}}
+
+
+class StubAnalyzer:
+    def __init__(self, degraded=False):
+        self.calls = 0
+        self.degraded = degraded
+
+    async def analyze_repository_simple(self, owner, repo, access_token=None, max_files=200):
+        self.calls += 1
+        now = datetime(2024, 1, 1)
+        return RepositoryAnalysis(
+            repository=Repository(
+                id=1,
+                name=repo,
+                full_name=f"{owner}/{repo}",
+                html_url=f"https://github.com/{owner}/{repo}",
+                clone_url=f"https://github.com/{owner}/{repo}.git",
+                created_at=now,
+                updated_at=now,
+            ),
+            analysis_timestamp=now,
+            code_metrics=CodeMetrics(),
+            quality_metrics=QualityMetrics(),
+            security_metrics=SecurityMetrics(),
+            tech_stack=TechStack(),
+            ai_insights=AIInsights(
+                overall_quality_score=50.0,
+                code_style_assessment="ok",
+                architecture_assessment="ok",
+                maintainability_assessment="ok",
+                best_practices_adherence=50.0,
+                project_maturity="developing",
+                development_stage="development",
+                maintenance_burden="low",
+                technology_relevance=50.0,
+                career_impact="medium",
+            ),
+            overall_score=50.0,
+            degraded=self.degraded,
+        )
+
+
+@pytest.fixture(autouse=True)
+def empty_analysis_cache():
+    auth._analysis_cache.clear()
+    yield
+    auth._analysis_cache.clear()
+
+
+def _client(analyzer):
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_github_client] = StubGitHubClient
+    app.dependency_overrides[get_analyzer_service] = lambda: analyzer
+    return TestClient(app)
+
+
+def test_matching_if_none_match_returns_304():
+    analyzer = StubAnalyzer()
+    client = _client(analyzer)
+
+    first = client.post("/api/auth/analyze-repository", json=BODY)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    second = client.post("/api/auth/analyze-repository", json=BODY, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    assert analyzer.calls == 1
+
+
+def test_repeat_request_is_served_from_the_cache():
+    analyzer = StubAnalyzer()
+    client = _client(analyzer)
+
+    first = client.post("/api/auth/analyze-repository", json=BODY)
+    second = client.post("/api/auth/analyze-repository", json=BODY)
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.json()["repository"]["full_name"] == "octo/repo"
+    assert analyzer.calls == 1
+
+
+def test_degraded_analysis_is_not_cached():
+    analyzer = StubAnalyzer(degraded=True)
+    client = _client(analyzer)
+
+    first = client.post("/api/auth/analyze-repository", json=BODY)
+    client.post("/api/auth/analyze-repository", json=BODY)
+
+    assert "ETag" not in first.headers
+    assert analyzer.calls == 2
@@ -0,0 +1,82 @@
+"""Tests for the GitHub client's conditional (ETag) request cache."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.services.github_client import GitHubClient
+
+
+@pytest.fixture(autouse=True)
+def no_server_tokens(monkeypatch):
+    """Run without the environment's tokens, so no rotator or state file is used."""
+    monkeypatch.setattr(settings, "github_token", "")
+    monkeypatch.setattr(settings, "github_tokens_str", "")
+
+
+def _run_with_client(handler, scenario):
+    """Run ``scenario(client)`` against a client whose requests go to ``handler``."""
+    async def main():
+        client = GitHubClient()
+        await client._http.aclose()
+        client._http = httpx.AsyncClient(base_url=settings.github_api_url, transport=httpx.MockTransport(handler))
+        try:
+            return await scenario(client)
+        finally:
+            await client._http.aclose()
+
+    return asyncio.run(main())
+
+
+def _etag_handler(requests, body):
+    """Serve ``body`` with an ETag and answer a matching If-None-Match with 304."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=body, headers={"ETag": '"v1"'})
+
+    return handler
+
+
+def test_not_modified_response_serves_the_cached_body():
+    requests = []
+    languages = {"Python": 1200, "Shell": 40}
+
+    async def scenario(client):
+        first = await client.get_repository_languages("octo", "repo")
+        second = await client.get_repository_languages("octo", "repo")
+        return first, second
+
+    first, second = _run_with_client(_etag_handler(requests, languages), scenario)
+
+    assert first == second == languages
+    assert [r.headers.get("If-None-Match") for r in requests] == [None, '"v1"']
+
+
+def test_cached_body_is_unaffected_by_callers_mutating_results():
+    requests = []
+
+    async def scenario(client):
+        first = await client.get_repository_languages("octo", "repo")
+        first["Injected"] = 1
+        return await client.get_repository_languages("octo", "repo")
+
+    second = _run_with_client(_etag_handler(requests, {"Python": 1200}), scenario)
+
+    assert second == {"Python": 1200}
+
+
+def test_rate_limit_status_is_never_revalidated():
+    requests = []
+
+    async def scenario(client):
+        await client.get_rate_limit_status()
+        return await client.get_rate_limit_status()
+
+    status = _run_with_client(_etag_handler(requests, {"rate": {"remaining": 60}}), scenario)
+
+    assert status == {"rate": {"remaining": 60}}
+    assert [r.headers.get("If-None-Match") for r in requests] == [None, None]
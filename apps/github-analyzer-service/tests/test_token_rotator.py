@@ -0,0 +1,59 @@
+"""Tests for token pacing and rate-limit blocking in the token rotator."""
+
+import asyncio
+import time
+
+from src.services import token_rotator
+from src.services.token_rotator import TokenRotator, TokenState
+
+
+def test_bucket_delays_requests_beyond_the_rate(monkeypatch):
+    # Freeze the clock so the bucket never refills during the test
+    monkeypatch.setattr(token_rotator.time, "monotonic", lambda: 100.0)
+    state = TokenState(token="t", rate=2.0, bucket=2.0)
+
+    delays = [TokenRotator._take_from_bucket(state) for _ in range(4)]
+
+    assert delays == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_throttling_halves_the_rate_and_successes_raise_it():
+    rotator = TokenRotator(["ghp_a"])
+    state = rotator.tokens["ghp_a"]
+    rate = state.rate
+
+    rotator.update_token_usage("ghp_a", throttled=True, success=False)
+    assert state.rate == rate / 2
+
+    rotator.update_token_usage("ghp_a", success=True)
+    assert state.rate > rate / 2
+
+
+def test_blocked_token_rests_until_blocked_until():
+    rotator = TokenRotator(["ghp_a", "ghp_b"])
+    reset = time.time() + 3600
+    for token in ("ghp_a", "ghp_b"):
+        rotator.update_token_usage(token, remaining_requests=4000, reset_timestamp=reset)
+
+    rotator.update_token_usage(
+        "ghp_a", success=False, throttled=True, blocked_until=time.time() + 60
+    )
+    assert asyncio.run(rotator.get_next_available_token()) == "ghp_b"
+
+    # Once the pause is over the token is released with its budget intact
+    rotator.tokens["ghp_a"].blocked_until = time.time() - 1
+    assert rotator.reset_blocked_tokens() == 1
+    assert not rotator.tokens["ghp_a"].is_blocked
+    assert rotator.tokens["ghp_a"].remaining_requests == 4000
+
+
+def test_response_from_an_earlier_window_is_ignored():
+    rotator = TokenRotator(["ghp_a"])
+    now = time.time()
+    rotator.update_token_usage("ghp_a", remaining_requests=4990, reset_timestamp=now + 3600)
+
+    rotator.update_token_usage("ghp_a", remaining_requests=12, reset_timestamp=now - 60)
+
+    state = rotator.tokens["ghp_a"]
+    assert state.remaining_requests == 4990
+    assert state.reset_time == now + 3600